@@ -1,12 +1,35 @@
 import os
+import re
+import base64
 import json
+import time
+import random
+import uuid
+import zlib
+import sqlite3
+import asyncio
+import signal
+import bisect
+import functools
+import threading
+from array import array
+from types import MappingProxyType
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import discord
 from discord.ext import commands
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+try:
+    import numpy as np
+except ImportError:  # counts fall back to a plain Python pass
+    np = None
 
 # ===========================
 # TIMEZONE
@@ -67,8 +90,125 @@ credentials = service_account.Credentials.from_service_account_info(
     service_info,
     scopes=["https://www.googleapis.com/auth/spreadsheets"]
 )
-sheets_service = build("sheets", "v4", credentials=credentials)
-sheet_api = sheets_service.spreadsheets().values()
+
+# Sheets calls run on a small worker pool so they never block the Discord event loop.
+SHEETS_MAX_WORKERS = int(os.getenv("SHEETS_MAX_WORKERS", "4"))
+
+_sheets_local = threading.local()
+
+def get_sheet_api():
+    """
+    Returns a spreadsheets().values() client owned by the calling thread.
+    googleapiclient's httplib2 transport is not thread-safe, so every worker builds its own.
+    """
+    api = getattr(_sheets_local, "sheet_api", None)
+    if api is None:
+        api = get_spreadsheet_api().values()
+        _sheets_local.sheet_api = api
+    return api
+
+def get_spreadsheet_api():
+    """spreadsheets() client owned by the calling thread (tab metadata and batchUpdate)."""
+    api = getattr(_sheets_local, "spreadsheet_api", None)
+    if api is None:
+        service = build("sheets", "v4", credentials=credentials, cache_discovery=False)
+        api = service.spreadsheets()
+        _sheets_local.spreadsheet_api = api
+    return api
+
+# Every Sheets request is executed through sheets_scheduler, which keeps us inside the
+# per-minute quota with separate read and write token buckets, and retries 429s (and
+# 5xx on reads) with jittered exponential backoff. Writes run on their own worker
+# (run_sheets_write) so a sale append never queues behind leaderboard or sync reads.
+SHEETS_READS_PER_MINUTE = int(os.getenv("SHEETS_READS_PER_MINUTE", "60"))
+SHEETS_WRITES_PER_MINUTE = int(os.getenv("SHEETS_WRITES_PER_MINUTE", "60"))
+SHEETS_MAX_RETRIES = int(os.getenv("SHEETS_MAX_RETRIES", "5"))
+SHEETS_BACKOFF_MAX_SECONDS = float(os.getenv("SHEETS_BACKOFF_MAX_SECONDS", "32"))
+# Below this much read headroom, background and heavy read paths serve cached data instead.
+SHEETS_LOW_HEADROOM = float(os.getenv("SHEETS_LOW_HEADROOM", "0.25"))
+
+class TokenBucket:
+    """rate_per_minute tokens, refilled continuously, holding at most a quarter-minute's worth."""
+
+    def __init__(self, rate_per_minute: int):
+        self.rate = max(rate_per_minute, 1) / 60.0
+        self.capacity = max(rate_per_minute / 4.0, 1.0)
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def try_take(self, now: float) -> float:
+        """Take a token and return 0, or return how long to wait before asking again."""
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def block_for(self, seconds: float, now: float):
+        """Sheets said 429: spend nothing more until the backoff has passed."""
+        self.tokens = 0.0
+        self.stamp = now
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def headroom(self, now: float) -> float:
+        self._refill(now)
+        return 0.0 if now < self.blocked_until else self.tokens / self.capacity
+
+class SheetsScheduler:
+    """Quota gate + retry loop around request.execute(). Safe to use from any Sheets worker thread."""
+
+    def __init__(self, reads_per_minute: int, writes_per_minute: int):
+        self._lock = threading.Lock()
+        self._buckets = {"read": TokenBucket(reads_per_minute), "write": TokenBucket(writes_per_minute)}
+
+    def _take(self, kind: str):
+        while True:
+            with self._lock:
+                wait = self._buckets[kind].try_take(time.monotonic())
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def execute(self, request, kind: str = "read"):
+        """
+        Run a googleapiclient request under the kind's bucket. Writes are only retried on 429
+        (rejected before anything was written); a 5xx append may have landed, so that one is
+        left to the caller.
+        """
+        attempt = 0
+        while True:
+            self._take(kind)
+            try:
+                return request.execute()
+            except HttpError as e:
+                status = getattr(e.resp, "status", 0)
+                retryable = status == 429 or (kind == "read" and status >= 500)
+                if not retryable or attempt >= SHEETS_MAX_RETRIES:
+                    raise
+                delay = random.uniform(0.5, 1.0) * min(SHEETS_BACKOFF_MAX_SECONDS, 2 ** attempt)
+                if status == 429:
+                    with self._lock:
+                        self._buckets[kind].block_for(delay, time.monotonic())
+                print(f"Sheets {kind} got HTTP {status}; retrying in {delay:.1f}s")
+                attempt += 1
+                time.sleep(delay)
+
+    def headroom(self, kind: str = "read") -> float:
+        """0.0 (no quota left, or backing off after a 429) to 1.0 (full burst available)."""
+        with self._lock:
+            return self._buckets[kind].headroom(time.monotonic())
+
+    def read_headroom_low(self) -> bool:
+        return self.headroom("read") < SHEETS_LOW_HEADROOM
+
+sheets_scheduler = SheetsScheduler(SHEETS_READS_PER_MINUTE, SHEETS_WRITES_PER_MINUTE)
 
 # ===========================
 # SHEET RANGES / SCHEMA
@@ -81,7 +221,13 @@ sheet_api = sheets_service.spreadsheets().values()
 #   E Customer
 #   F ISP
 #   G Plan
-SHEET_RANGE = "Sheet1!A:G"
+#   H SubmissionId (one per /sale or /bulklog flow)
+#   I Quantity (blank = 1; a dealer bulk log is one row carrying its count)
+SHEET_TAB = "Sheet1"
+SHEET_FIRST_COL, SHEET_LAST_COL = "A", "I"
+SHEET_RANGE = f"{SHEET_TAB}!{SHEET_FIRST_COL}:{SHEET_LAST_COL}"
+# Counts only depend on Timestamp..Customer and Quantity; ISP and Plan are display-only.
+SHEET_COUNT_RANGES = ("A:E", "I:I")
 
 # Roster columns:
 #   A RepId
@@ -134,23 +280,28 @@ def get_dealer_group_name(interaction: discord.Interaction) -> str:
 # ===========================
 # GOOGLE SHEETS: APPEND
 # ===========================
-def append_sale_to_sheet(rep_id: int, rep_name: str, manager: str, customer: str, isp: str, plan: str):
+def new_submission_id() -> str:
+    """Created once per sale flow; a retry or double-click reuses it, so the sale lands once."""
+    return uuid.uuid4().hex
+
+def build_sale_row(rep_id: int, rep_name: str, manager: str, customer: str, isp: str, plan: str, submission_id: str):
     ts = datetime.now(ET).strftime("%Y-%m-%d %H:%M:%S ET")
-    row = [[ts, str(rep_id), rep_name, manager, customer, isp, plan]]
-    sheet_api.append(
-        spreadsheetId=GOOGLE_SHEET_ID,
-        range=SHEET_RANGE,
-        valueInputOption="RAW",
-        body={"values": row},
-    ).execute()
+    return [ts, str(rep_id), rep_name, manager, customer, isp, plan, submission_id]
 
 def append_sales_batch_to_sheet(rows: list[list[str]]):
-    sheet_api.append(
+    """Append rows to Sheet1. Returns the sheet row the first one landed on (None if Sheets didn't say)."""
+    resp = sheets_scheduler.execute(get_sheet_api().append(
         spreadsheetId=GOOGLE_SHEET_ID,
         range=SHEET_RANGE,
         valueInputOption="RAW",
         body={"values": rows},
-    ).execute()
+    ), "write")
+
+    written = _parse_updated_range(resp.get("updates", {}).get("updatedRange", ""))
+    if not written:
+        return None
+    sales_sheet_tail.note_append(written[0], rows)
+    return written[0]
 
 # ===========================
 # TIMESTAMP PARSING
@@ -166,125 +317,732 @@ def _parse_et_timestamp(ts_str: str):
     except Exception:
         return None
 
+def day_key(d) -> int:
+    """date/datetime -> 20261018"""
+    return d.year * 10000 + d.month * 100 + d.day
+
+def month_key(d) -> int:
+    """date/datetime -> 202610"""
+    return d.year * 100 + d.month
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_EPOCH_DAY_MEMO = {}
+
+def epoch_day(key: int) -> int:
+    """day_key (20261018) -> days since 1970-01-01."""
+    n = _EPOCH_DAY_MEMO.get(key)
+    if n is None:
+        n = date(key // 10000, key // 100 % 100, key % 100).toordinal() - _EPOCH_ORDINAL
+        _EPOCH_DAY_MEMO[key] = n
+    return n
+
+# "YYYY-MM-DD" -> (day_key, month_key). Bulk logs write hundreds of identical
+# timestamps and a busy day only has one date, so this stays tiny.
+_TS_DATE_MEMO = {}
+
+def _decode_date_prefix(prefix: str):
+    keys = _TS_DATE_MEMO.get(prefix)
+    if keys is not None:
+        return keys
+    if prefix[4] != "-" or prefix[7] != "-":
+        return None
+    y, m, d = prefix[:4], prefix[5:7], prefix[8:10]
+    if not (y.isdigit() and m.isdigit() and d.isdigit()):
+        return None
+    try:
+        parsed = date(int(y), int(m), int(d))
+    except ValueError:
+        return None
+    keys = (day_key(parsed), month_key(parsed))
+    _TS_DATE_MEMO[prefix] = keys
+    return keys
+
+def decode_et_timestamp(ts_str: str):
+    """
+    Fast decoder for the fixed-width 'YYYY-MM-DD HH:MM:SS ET' cells the bot writes.
+    Returns (day_key, month_key, "YYYY-MM-DD HH:MM:SS") or None if the cell isn't a timestamp.
+    Anything that isn't byte-for-byte in our format (hand edits) goes through _parse_et_timestamp.
+    """
+    ts_str = ts_str.strip()
+    if (
+        len(ts_str) == 22 and ts_str[10] == " " and ts_str[13] == ":"
+        and ts_str[16] == ":" and ts_str[19:] == " ET"
+    ):
+        keys = _decode_date_prefix(ts_str[:10])
+        hh, mm, ss = ts_str[11:13], ts_str[14:16], ts_str[17:19]
+        if keys and hh.isdigit() and mm.isdigit() and ss.isdigit() and hh < "24" and mm < "60" and ss < "62":
+            return keys[0], keys[1], ts_str[:19]
+
+    dt = _parse_et_timestamp(ts_str)
+    if not dt:
+        return None
+    return day_key(dt), month_key(dt), dt.strftime("%Y-%m-%d %H:%M:%S")
+
 # ===========================
 # READ SALES ROWS
 # ===========================
-def fetch_sales_rows():
-    """Returns all rows excluding header (if present)."""
-    resp = sheet_api.get(
-        spreadsheetId=GOOGLE_SHEET_ID,
-        range=SHEET_RANGE
-    ).execute()
+# Sheet1 is append-only in practice, so we remember how far we've read and only ask
+# Sheets for the tail (Sheet1!A{n+1}:I). Our own appends move the cursor straight from
+# the updatedRange Sheets returns. Every SALES_SHEET_CHECKSUM_SECONDS the counted columns
+# (A:E and I) are read and checked row-by-row (CRC32) against what we saw to catch hand
+# edits further up; only a mismatch costs a full A:I read.
+SALES_SHEET_CHECKSUM_SECONDS = int(os.getenv("SALES_SHEET_CHECKSUM_SECONDS", "900"))
 
-    values = resp.get("values", [])
-    if not values:
-        return []
+def _is_sales_header(row) -> bool:
+    first = [str(c).strip().lower() for c in row] if row else []
+    return bool(first) and (("timestamp" in first[0]) or ("rep" in "".join(first)))
 
-    # Safe header detection
-    first_row = values[0] if values else []
-    first = [str(c).strip().lower() for c in first_row] if first_row else []
-    header_like = False
-    if first:
-        header_like = ("timestamp" in first[0]) or ("rep" in "".join(first))
-    if header_like:
-        values = values[1:]
+def _row_crc(row) -> int:
+    return zlib.crc32("\x1f".join(row).encode("utf-8"))
+
+def _column_span(a1_cols: str):
+    """'A:E' -> range(0, 5)"""
+    first, last = a1_cols.split(":")
+    return range(ord(first) - ord("A"), ord(last) - ord("A") + 1)
 
-    return values
+_COUNT_INDEXES = [i for cols in SHEET_COUNT_RANGES for i in _column_span(cols)]
+
+def _counted_cells(row):
+    """A full Sheet1 row cut down to the SHEET_COUNT_RANGES columns (the layout read_sales_columns returns)."""
+    return [row[i] if i < len(row) else "" for i in _COUNT_INDEXES]
+
+def _count_crc(cells) -> int:
+    """CRC32 of a row's counted columns (see _counted_cells), so a projected read can be checked against it."""
+    return _row_crc(_row_key(cells))
+
+def read_sales_columns(col_ranges=SHEET_COUNT_RANGES):
+    """
+    Just the given Sheet1 column ranges, in one batchGet, fetched column-major (one list
+    per column, no per-row brackets) and handed back as rows padded with "". Values stay
+    formatted: RepIds are 18+ digit snowflakes, which an unformatted (float) read would round.
+    """
+    resp = sheets_scheduler.execute(get_sheet_api().batchGet(
+        spreadsheetId=GOOGLE_SHEET_ID,
+        ranges=[f"{SHEET_TAB}!{cols}" for cols in col_ranges],
+        majorDimension="COLUMNS",
+    ))
+    columns = []
+    for cols, vr in zip(col_ranges, resp.get("valueRanges", [])):
+        got = vr.get("values", [])
+        columns.extend(got[i] if i < len(got) else [] for i in range(len(_column_span(cols))))
+    height = max(map(len, columns), default=0)
+    return [[col[i] if i < len(col) else "" for col in columns] for i in range(height)]
+
+def _parse_updated_range(a1: str):
+    """'Sheet1!A12:G14' -> (12, 14); None if Sheets didn't give us a row range."""
+    m = re.search(r"![A-Z]+(\d+)(?::[A-Z]+(\d+))?$", a1 or "")
+    if not m:
+        return None
+    start = int(m.group(1))
+    return start, int(m.group(2) or start)
+
+class SalesSheetTail:
+    """
+    Sync cursor over Sheet1. Rows themselves aren't kept (they live in the mirror); per
+    sheet row we only hold a CRC32 of its counted columns, so the periodic checksum pass
+    only has to download those to tell whether anything above the tail changed.
+    generation changes whenever that check fails.
+    Safe to use from any Sheets worker thread.
+    """
+
+    def __init__(self):
+        self._sync_lock = threading.Lock()   # one network read at a time
+        self._lock = threading.Lock()        # guards the cursor state
+        self._crcs = array("I")              # _crcs[i] is sheet row i + 1
+        self.generation = 0
+        self._loaded = False
+        self._stale = False
+        self._last_full = 0.0
+
+    def _apply(self, start_row: int, rows):
+        """
+        Advance over rows that begin at sheet row start_row. Caller holds _lock.
+        Returns [(sheet_row, row)] for the data rows that were new to us.
+        """
+        added = []
+        for offset, row in enumerate(rows):
+            row_number = start_row + offset
+            if row_number <= len(self._crcs):
+                continue
+            if row_number != len(self._crcs) + 1:
+                break
+            cells = list(_row_key(row))
+            self._crcs.append(_count_crc(_counted_cells(cells)))
+            if row_number == 1 and _is_sales_header(cells):
+                continue
+            added.append((row_number, cells))
+        return added
+
+    def _read(self, range_a1: str):
+        resp = sheets_scheduler.execute(get_sheet_api().get(spreadsheetId=GOOGLE_SHEET_ID, range=range_a1))
+        return resp.get("values", [])
+
+    def sync(self, full_values=None):
+        """
+        Catch up with Sheet1: a tail read normally, a full read when the checksum pass is due.
+        full_values is a full Sheet1 read the caller already has; it is used as the full read.
+        Returns (generation, rebuilt, [(sheet_row, row)]). When rebuilt is True the list is
+        every data row in the sheet; otherwise it is only the rows appended since the last sync.
+        """
+        with self._sync_lock:
+            full_due = time.monotonic() - self._last_full >= SALES_SHEET_CHECKSUM_SECONDS
+            if full_due and self._loaded and not self._stale and sheets_scheduler.read_headroom_low():
+                full_due = False  # the checksum pass can wait for quota; the tail read can't
+            if full_due and full_values is None and self._loaded and not self._stale:
+                # Routine checksum pass: projected read first, full read only on a mismatch.
+                if self._counted_columns_unchanged():
+                    self._last_full = time.monotonic()
+                    full_due = False
+            if full_values is not None or not self._loaded or self._stale or full_due:
+                if full_values is None:
+                    full_values = self._read(SHEET_RANGE)
+                fresh = [list(_row_key(r)) for r in full_values]
+                with self._lock:
+                    # A shorter sheet means rows were deleted by hand: rebuild, don't just compare.
+                    n = len(self._crcs)
+                    rebuilt = not (self._loaded and not self._stale and len(fresh) >= n and all(
+                        _count_crc(_counted_cells(fresh[i])) == self._crcs[i] for i in range(n)
+                    ))
+                    if rebuilt:
+                        self._crcs = array("I")
+                        self.generation += 1
+                        self._loaded = True
+                        self._stale = False
+                    added = self._apply(1, fresh)
+                    generation = self.generation
+                self._last_full = time.monotonic()
+                return generation, rebuilt, added
+
+            start = len(self._crcs) + 1
+            rows = self._read(f"{SHEET_TAB}!{SHEET_FIRST_COL}{start}:{SHEET_LAST_COL}")
+            with self._lock:
+                return self.generation, False, self._apply(start, rows)
+
+    def _counted_columns_unchanged(self) -> bool:
+        with self._lock:
+            n = len(self._crcs)  # rows our own appends add meanwhile aren't checked this round
+        projected = read_sales_columns()
+        with self._lock:
+            return len(projected) >= n and all(_count_crc(projected[i]) == self._crcs[i] for i in range(n))
+
+    def request_full_read(self, rebuild: bool = False):
+        """Make the next sync a full read + checksum pass (and a forced rebuild if asked)."""
+        self._last_full = 0.0
+        if rebuild:
+            self._stale = True
+
+    def export_state(self):
+        """Cursor state for the warm-start snapshot, or None if the next sync must be a full read anyway."""
+        with self._lock:
+            if not self._loaded or self._stale:
+                return None
+            return {
+                "crcs": bytes(self._crcs),
+                "checksum_age": time.monotonic() - self._last_full,
+            }
+
+    def restore(self, state: dict, age: float):
+        """Resume from an export_state() taken age seconds ago; the next sync is a tail read."""
+        crcs = array("I")
+        crcs.frombytes(state["crcs"])
+        with self._lock:
+            self._crcs = crcs
+            self.generation += 1
+            self._loaded = True
+            self._stale = False
+            # Keep the checksum schedule: a pass that was due before the restart is still due.
+            self._last_full = time.monotonic() - state["checksum_age"] - max(age, 0)
+
+    def note_append(self, start_row: int, rows):
+        """
+        Skip the cursor past rows our own append just wrote at start_row (from updatedRange).
+        Those sales are already in the mirror as local rows, so they aren't handed out again.
+        """
+        with self._lock:
+            if not self._loaded:
+                return
+            # A tail read may already have passed over these rows (it ran before the append
+            # response got back to us). That's fine as long as what it saw is what we wrote;
+            # anything else means rows above were removed by hand and only a full read lines us up.
+            for offset, row in enumerate(rows):
+                row_number = start_row + offset
+                if row_number > len(self._crcs):
+                    break
+                if self._crcs[row_number - 1] != _count_crc(_counted_cells(list(_row_key(row)))):
+                    self._stale = True
+                    return
+            # A gap means someone else's rows landed first; the next tail read picks up both.
+            self._apply(start_row, rows)
+
+sales_sheet_tail = SalesSheetTail()
+
+def number_sales_rows(values):
+    """Sheet1 values (from row 1) -> [(sheet_row, row)], header excluded."""
+    first = 2 if values and _is_sales_header(values[0]) else 1
+    return [(first + i, row) for i, row in enumerate(values[first - 1:])]
+
+def fetch_numbered_sales_rows():
+    """Full read of Sheet1 as [(sheet_row, row)], header excluded."""
+    return number_sales_rows(sales_sheet_tail._read(SHEET_RANGE))
 
 # ===========================
 # COUNTS
 # ===========================
-def compute_counts(rows, *, mode: str, key: str = "rep", exclude_dealer_rows: bool = False):
+# Every count comes from one live SalesAggregate: hydrated from a columnar copy of the
+# local Sheet1 mirror (ColumnarSales, see SALES MIRROR below), then updated in place as
+# rows enter or leave the mirror, so reads never rescan anything.
+COUNT_MODES = ("daily", "monthly", "ytd", "all")
+
+class SalesAggregate:
     """
-    mode in {"daily","monthly","ytd","all"}
-    key in {"rep","manager"} determines grouping.
-    exclude_dealer_rows: if True, skips rows where Customer == "Dealer"
+    Live daily / monthly / YTD / all-time counts keyed by rep and by manager, each also
+    available with Dealer rows excluded.
+
+    Hydrated from ColumnarSales.aggregate(), then kept current in place by every
+    mirror write (SalesMirror.apply_counts). Daily/monthly/YTD buckets roll over at ET
+    midnight via roll_to(). Reads return copies, so callers can sort them freely while
+    the sales-db thread keeps updating.
 
-    Columns (Sheet1):
-      A Timestamp
-      B RepId
-      C RepName
-      D Manager
-      E Customer
-      F ISP
-      G Plan
+    Rep counts are keyed by RepId (RepName when the id cell is blank),
+    manager counts by Manager ("Unassigned" when blank).
     """
-    now = datetime.now(ET)
-    counts = {}
 
-    for r in rows:
-        if len(r) < 4:
-            continue
+    def __init__(self, as_of: date):
+        self._lock = threading.Lock()
+        self.as_of = as_of
+        # (key, exclude_dealer_rows) -> mode -> {group: count}
+        self._tables = {
+            (key, excl): {mode: {} for mode in COUNT_MODES}
+            for key in ("rep", "manager")
+            for excl in (False, True)
+        }
 
-        ts = _parse_et_timestamp(str(r[0]))
-        rep_id = str(r[1]).strip()
-        rep_name = str(r[2]).strip()
-        manager = str(r[3]).strip()
-        customer = str(r[4]).strip() if len(r) >= 5 else ""
+    def add(self, rep_key: str, manager_key: str, is_dealer: bool, period_counts: dict):
+        with self._lock:
+            self._add(rep_key, manager_key, is_dealer, period_counts)
+
+    def _add(self, rep_key: str, manager_key: str, is_dealer: bool, period_counts: dict):
+        """Caller holds _lock."""
+        for excl in (False, True):
+            if excl and is_dealer:
+                continue
+            for key, group in (("rep", rep_key), ("manager", manager_key)):
+                table = self._tables[(key, excl)]
+                for mode, n in period_counts.items():
+                    if not n:
+                        continue
+                    total = table[mode].get(group, 0) + n
+                    if total > 0:
+                        table[mode][group] = total
+                    else:
+                        table[mode].pop(group, None)
+
+    def set_counts(self, key: str, exclude_dealer_rows: bool, mode: str, counts: dict):
+        """Replace one whole {group: count} table (used while hydrating)."""
+        with self._lock:
+            self._tables[(key, exclude_dealer_rows)][mode] = counts
+
+    def apply(self, rep_key: str, manager_key: str, is_dealer: bool, day: int, month: int, delta: int = 1):
+        """
+        Count (delta > 0) or uncount (delta < 0) sales stamped with day/month keys.
+        A sale from after as_of means ET midnight has passed since the last read: the buckets
+        roll first (in the same critical section), so it lands in the new day's.
+        """
+        with self._lock:
+            if day > day_key(self.as_of):
+                self._roll(datetime.now(ET).date())
+            as_of = self.as_of
+            self._add(rep_key, manager_key, is_dealer, {
+                "daily": delta if day == day_key(as_of) else 0,
+                "monthly": delta if month == month_key(as_of) else 0,
+                "ytd": delta if month // 100 == as_of.year else 0,
+                "all": delta,
+            })
+
+    def roll_to(self, today: date):
+        """Start fresh daily (and monthly / YTD) buckets once the ET date moves past as_of."""
+        with self._lock:
+            self._roll(today)
+
+    def _roll(self, today: date):
+        """Caller holds _lock."""
+        if today <= self.as_of:
+            return
+        if today.year != self.as_of.year:
+            stale = ("daily", "monthly", "ytd")
+        elif today.month != self.as_of.month:
+            stale = ("daily", "monthly")
+        else:
+            stale = ("daily",)
+        for table in self._tables.values():
+            for mode in stale:
+                table[mode] = {}
+        self.as_of = today
 
-        if not ts:
-            continue
+    def counts(self, mode: str, key: str = "rep", exclude_dealer_rows: bool = False):
+        with self._lock:
+            return dict(self._tables[("manager" if key == "manager" else "rep", exclude_dealer_rows)].get(mode, {}))
 
-        # ✅ Exclude dealer bulk rows from rep leaderboard (and anything else that opts in)
-        if exclude_dealer_rows and customer.lower() == "dealer":
-            continue
+    def rep_counts(self, rep_key: str):
+        with self._lock:
+            table = self._tables[("rep", False)]
+            return {mode: table[mode].get(rep_key, 0) for mode in ("daily", "monthly", "ytd")}
 
-        include = False
-        if mode == "all":
-            include = True
-        elif mode == "daily":
-            include = (ts.date() == now.date())
-        elif mode == "monthly":
-            include = (ts.year == now.year and ts.month == now.month)
-        elif mode == "ytd":
-            include = (ts.year == now.year)
-
-        if not include:
-            continue
+    def totals(self):
+        with self._lock:
+            table = self._tables[("rep", False)]
+            return {mode: sum(table[mode].values()) for mode in COUNT_MODES}
 
-        if key == "manager":
-            k = manager or "Unassigned"
-        else:
-            # Use stable RepId for grouping
-            k = rep_id if rep_id else rep_name
+SALE_FLAG_DEALER = 0x01
 
-        counts[k] = counts.get(k, 0) + 1
+class _Interner:
+    """Small-int codes for repeated strings. A code never changes once handed out."""
 
-    return counts
+    def __init__(self):
+        self.codes = {}
+        self.names = []
 
-def get_rep_counts(rep_id: int):
-    """Returns {"daily": n, "monthly": n, "ytd": n} computed from the sheet."""
-    rows = fetch_sales_rows()
-    rep_key = str(rep_id)
-    daily = compute_counts(rows, mode="daily", key="rep").get(rep_key, 0)
-    monthly = compute_counts(rows, mode="monthly", key="rep").get(rep_key, 0)
-    ytd = compute_counts(rows, mode="ytd", key="rep").get(rep_key, 0)
-    return {"daily": daily, "monthly": monthly, "ytd": ytd}
+    def code(self, name: str) -> int:
+        c = self.codes.get(name)
+        if c is None:
+            c = len(self.names)
+            self.codes[name] = c
+            self.names.append(name)
+        return c
+
+_COLUMN_BUFFERS = ("day", "rep", "manager", "isp", "plan", "flags", "weight")
+_COLUMN_INTERNERS = ("reps", "managers", "isps", "plans")
+
+class ColumnarSales:
+    """
+    Counted sales held column by column in flat buffers: epoch day as int32, rep / manager /
+    ISP / plan as interned codes, flag bits (SALE_FLAG_DEALER) and a weight (+quantity per
+    row, -quantity when a row leaves the mirror). About 20 bytes a row instead of a list of strings.
+
+    Appended to by every mirror write alongside the live counters and reloaded compactly
+    from the table on rehydrate. Sales-db worker thread only.
+    """
+
+    def __init__(self):
+        self.day = array("i")
+        self.rep = array("I")
+        self.manager = array("H")
+        self.isp = array("H")
+        self.plan = array("H")
+        self.flags = bytearray()
+        self.weight = array("i")
+        self.reps = _Interner()
+        self.managers = _Interner()
+        self.isps = _Interner()
+        self.plans = _Interner()
+
+    def __len__(self):
+        return len(self.day)
+
+    def add(self, day: int, rep_key: str, manager_key: str, isp: str, plan: str, is_dealer: bool, weight: int = 1):
+        self.day.append(epoch_day(day))
+        self.rep.append(self.reps.code(rep_key))
+        self.manager.append(self.managers.code(manager_key))
+        self.isp.append(self.isps.code(isp))
+        self.plan.append(self.plans.code(plan))
+        self.flags.append(SALE_FLAG_DEALER if is_dealer else 0)
+        self.weight.append(weight)
+
+    def to_state(self) -> dict:
+        """Plain-data copy for the warm-start snapshot (buffers as raw bytes)."""
+        return {
+            "buffers": {name: bytes(getattr(self, name)) for name in _COLUMN_BUFFERS},
+            "names": {name: list(getattr(self, name).names) for name in _COLUMN_INTERNERS},
+        }
+
+    @classmethod
+    def from_state(cls, state: dict):
+        cols = cls()
+        for name in _COLUMN_BUFFERS:
+            buf = getattr(cols, name)
+            if isinstance(buf, bytearray):
+                buf.extend(state["buffers"][name])
+            else:
+                buf.frombytes(state["buffers"][name])
+        for name in _COLUMN_INTERNERS:
+            interner = getattr(cols, name)
+            for n in state["names"][name]:
+                interner.code(n)
+        if len({len(getattr(cols, name)) for name in _COLUMN_BUFFERS}) != 1:
+            raise ValueError("column buffers differ in length")
+        return cols
+
+    @classmethod
+    def load(cls, db):
+        cols = cls()
+        found = db.execute(
+            f"SELECT day_key, {_REP_KEY_SQL}, {_MANAGER_KEY_SQL}, isp, plan, is_dealer, quantity "
+            "FROM sales WHERE day_key IS NOT NULL"
+        )
+        for day, rep_key, manager_key, isp, plan, is_dealer, quantity in found:
+            cols.add(day, rep_key, manager_key, isp, plan, bool(is_dealer), quantity)
+        return cols
+
+    def _period_bounds(self, as_of: date):
+        """mode -> (first epoch day, last epoch day + 1), None for all-time."""
+        next_month = (as_of.replace(day=28) + timedelta(days=4)).replace(day=1)
+        today = epoch_day(day_key(as_of))
+        return {
+            "daily": (today, today + 1),
+            "monthly": (epoch_day(day_key(as_of.replace(day=1))), epoch_day(day_key(next_month))),
+            "ytd": (epoch_day(day_key(date(as_of.year, 1, 1))), epoch_day(day_key(date(as_of.year + 1, 1, 1)))),
+            "all": None,
+        }
+
+    def aggregate(self, as_of: date) -> SalesAggregate:
+        """Counts for every period, rep, manager and dealer flag as of the given ET date."""
+        agg = SalesAggregate(as_of)
+        if not len(self):
+            return agg
+        bounds = self._period_bounds(as_of)
+        groups = (("rep", self.rep, self.reps.names), ("manager", self.manager, self.managers.names))
+
+        if np is None:
+            for key, codes, names in groups:
+                for excl in (False, True):
+                    for mode, span in bounds.items():
+                        tally = [0] * len(names)
+                        for d, c, f, w in zip(self.day, codes, self.flags, self.weight):
+                            if excl and f & SALE_FLAG_DEALER:
+                                continue
+                            if span is None or span[0] <= d < span[1]:
+                                tally[c] += w
+                        agg.set_counts(key, excl, mode, {names[c]: n for c, n in enumerate(tally) if n > 0})
+            return agg
+
+        day = np.frombuffer(self.day, dtype=f"i{self.day.itemsize}")
+        weight = np.frombuffer(self.weight, dtype=f"i{self.weight.itemsize}").astype(np.int64)
+        kept = (np.frombuffer(self.flags, dtype="u1") & SALE_FLAG_DEALER) == 0
+        in_period = {
+            mode: None if span is None else (day >= span[0]) & (day < span[1])
+            for mode, span in bounds.items()
+        }
+        for key, codes, names in groups:
+            codes = np.frombuffer(codes, dtype=f"u{codes.itemsize}")
+            for excl in (False, True):
+                base = np.where(kept, weight, 0) if excl else weight
+                for mode, mask in in_period.items():
+                    w = base if mask is None else np.where(mask, base, 0)
+                    tally = np.bincount(codes, weights=w, minlength=len(names))
+                    agg.set_counts(key, excl, mode, {names[c]: int(tally[c]) for c in np.flatnonzero(tally > 0)})
+        return agg
+
+class DayBucketIndex:
+    """
+    Per-day sales buckets with running totals, for counts over any [first, last] date range.
+
+    days holds every epoch day that has sales, in order. For each (key, exclude_dealer_rows)
+    table, prefix[code][i] is that group's count over days[:i], so a range count is two
+    lookups per group. Follows one ColumnarSales: sync() folds in rows appended since the
+    last call (today's sales only touch the last entry). Sales-db worker thread only.
+    """
+
+    def __init__(self, columns: ColumnarSales):
+        self.columns = columns
+        self.days = array("i")
+        self._prefix = {(key, excl): [] for key in ("rep", "manager") for excl in (False, True)}
+        self._seen = 0
+        self.sync(order=sorted(range(len(columns)), key=columns.day.__getitem__))
+
+    def _fold(self, day: int, rep_code: int, manager_code: int, flags: int, weight: int):
+        i = bisect.bisect_left(self.days, day)
+        if i == len(self.days) or self.days[i] != day:
+            self.days.insert(i, day)
+            for table in self._prefix.values():
+                for sums in table:
+                    sums.insert(i + 1, sums[i])
+        for (key, excl), table in self._prefix.items():
+            if excl and flags & SALE_FLAG_DEALER:
+                continue
+            code = rep_code if key == "rep" else manager_code
+            while len(table) <= code:
+                table.append(array("i", [0]) * (len(self.days) + 1))
+            sums = table[code]
+            for k in range(i + 1, len(sums)):
+                sums[k] += weight
+
+    def sync(self, order=None):
+        """Fold in rows the columnar store gained since the last call."""
+        cols = self.columns
+        for n in order if order is not None else range(self._seen, len(cols)):
+            self._fold(cols.day[n], cols.rep[n], cols.manager[n], cols.flags[n], cols.weight[n])
+        self._seen = len(cols)
+
+    def counts(self, first: date, last: date, key: str = "rep", exclude_dealer_rows: bool = False):
+        """{group: count} for sales stamped first..last (inclusive ET dates)."""
+        i = bisect.bisect_left(self.days, epoch_day(day_key(first)))
+        j = bisect.bisect_right(self.days, epoch_day(day_key(last)))
+        names = (self.columns.managers if key == "manager" else self.columns.reps).names
+        table = self._prefix[("manager" if key == "manager" else "rep", exclude_dealer_rows)]
+        found = {}
+        for code, sums in enumerate(table):
+            n = sums[j] - sums[i]
+            if n > 0:
+                found[names[code]] = n
+        return found
+
+# Leaderboard timeframes beyond the live COUNT_MODES, all answered from the DayBucketIndex.
+# value -> (label, picker description)
+TIMEFRAMES = {
+    "daily": ("Daily", "Today only"),
+    "weekly": ("Weekly", "This week (Mon–today)"),
+    "monthly": ("Monthly", "This month"),
+    "ytd": ("YTD", "Year-to-date"),
+    "last_month": ("Last month", "Previous calendar month"),
+    "last_quarter": ("Last quarter", "Previous calendar quarter"),
+    "same_week_last_year": ("Same week last year", "This week, one year ago"),
+}
 
-def get_total_counts():
-    rows = fetch_sales_rows()
-    daily = sum(compute_counts(rows, mode="daily", key="rep").values())
-    monthly = sum(compute_counts(rows, mode="monthly", key="rep").values())
-    ytd = sum(compute_counts(rows, mode="ytd", key="rep").values())
-    all_time = sum(compute_counts(rows, mode="all", key="rep").values())
-    return {"daily": daily, "monthly": monthly, "ytd": ytd, "all": all_time}
+def _quarter_start(d: date) -> date:
+    return date(d.year, 3 * ((d.month - 1) // 3) + 1, 1)
+
+def timeframe_range(mode: str, as_of: date):
+    """(first, last) ET dates covered by a TIMEFRAMES mode, seen from as_of."""
+    if mode == "daily":
+        return as_of, as_of
+    if mode == "weekly":
+        return as_of - timedelta(days=as_of.weekday()), as_of
+    if mode == "monthly":
+        return as_of.replace(day=1), as_of
+    if mode == "ytd":
+        return date(as_of.year, 1, 1), as_of
+    if mode == "last_month":
+        last = as_of.replace(day=1) - timedelta(days=1)
+        return last.replace(day=1), last
+    if mode == "last_quarter":
+        last = _quarter_start(as_of) - timedelta(days=1)
+        return _quarter_start(last), last
+    if mode == "same_week_last_year":
+        year, week, _ = as_of.isocalendar()
+        try:
+            first = date.fromisocalendar(year - 1, week, 1)
+        except ValueError:  # week 53 that last year didn't have
+            first = date.fromisocalendar(year - 1, week - 1, 1)
+        return first, first + timedelta(days=6)
+    raise ValueError(f"Unknown timeframe: {mode}")
+
+async def get_sales_aggregate() -> SalesAggregate:
+    """The live counters, hydrated on first use and rolled to today's ET date."""
+    await ensure_sales_mirror()
+    counters = sales_mirror.counters
+    if counters is None:
+        counters = await run_db_call(sales_mirror.hydrated)
+    counters.roll_to(datetime.now(ET).date())
+    return counters
+
+async def compute_counts(*, mode: str, key: str = "rep", exclude_dealer_rows: bool = False):
+    """
+    mode in {"daily","monthly","ytd","all"}
+    key in {"rep","manager"} determines grouping.
+    exclude_dealer_rows: if True, skips rows where Customer == "Dealer"
+    """
+    return (await get_sales_aggregate()).counts(mode, key=key, exclude_dealer_rows=exclude_dealer_rows)
+
+async def compute_range_counts(first: date, last: date, *, key: str = "rep", exclude_dealer_rows: bool = False):
+    """Like compute_counts, for sales stamped first..last (inclusive ET dates)."""
+    await ensure_sales_mirror()
+    return await run_db_call(sales_mirror.range_counts, first, last, key, exclude_dealer_rows)
+
+async def compute_timeframe_counts(mode: str, *, key: str = "rep", exclude_dealer_rows: bool = False, as_of: date = None):
+    """
+    Counts for a TIMEFRAMES mode. Today's daily/monthly/YTD come from the live counters;
+    everything else (and any as_of date) from the day index.
+    """
+    if as_of is None and mode in COUNT_MODES:
+        return await compute_counts(mode=mode, key=key, exclude_dealer_rows=exclude_dealer_rows)
+    first, last = timeframe_range(mode, as_of or datetime.now(ET).date())
+    return await compute_range_counts(first, last, key=key, exclude_dealer_rows=exclude_dealer_rows)
+
+# Opening the /leaderboard or /managerboard picker starts one pass that counts every
+# timeframe for both boards; the select then renders from it. Results are reused for as
+# long as the mirror hasn't changed (same version, same ET day), and opens that arrive
+# while a pass is running share it.
+LEADERBOARD_BOARDS = (("rep", True), ("manager", False))  # as the boards count: reps without Dealer rows
+_BOARD_PRECOMPUTE = {}  # as_of -> {"version", "day", "task"}
+_BOARD_PRECOMPUTE_MAX = 8
+
+async def _precompute_boards(as_of: date):
+    await ensure_sales_mirror()
+    return await run_db_call(sales_mirror.board_counts, LEADERBOARD_BOARDS, as_of)
+
+def _board_precompute_done(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()  # consumed here; the select falls back to computing its own timeframe
+
+def start_board_precompute(as_of: date = None) -> asyncio.Task:
+    """The precompute pass for as_of: the cached one while still fresh, else a new one."""
+    entry = _BOARD_PRECOMPUTE.get(as_of)
+    today = datetime.now(ET).date()
+    if entry is not None:
+        task = entry["task"]
+        if not task.done():
+            return task
+        if not task.cancelled() and task.exception() is None:
+            version, _ = task.result()
+            if version == sales_mirror.version and entry["day"] == today:
+                return task
+    if as_of not in _BOARD_PRECOMPUTE and len(_BOARD_PRECOMPUTE) >= _BOARD_PRECOMPUTE_MAX:
+        _BOARD_PRECOMPUTE.pop(next(iter(_BOARD_PRECOMPUTE)))
+    task = asyncio.create_task(_precompute_boards(as_of))
+    task.add_done_callback(_board_precompute_done)
+    _BOARD_PRECOMPUTE[as_of] = {"day": today, "task": task}
+    return task
+
+async def board_timeframe_counts(mode: str, *, key: str, exclude_dealer_rows: bool, as_of: date = None):
+    """
+    compute_timeframe_counts for a leaderboard picker, served from the precompute pass.
+    Returns (mirror version the counts are from, counts); the version is None if the pass
+    failed and the counts were computed on the spot.
+    The dict may be shared with other callers: read it, don't change it.
+    """
+    try:
+        version, results = await asyncio.shield(start_board_precompute(as_of))
+        return version, results[(mode, key, exclude_dealer_rows)]
+    except Exception:
+        return None, await compute_timeframe_counts(mode, key=key, exclude_dealer_rows=exclude_dealer_rows, as_of=as_of)
+
+async def get_rep_counts(rep_id: int):
+    """Returns {"daily": n, "monthly": n, "ytd": n} for one rep."""
+    return (await get_sales_aggregate()).rep_counts(str(rep_id))
+
+async def get_total_counts():
+    return (await get_sales_aggregate()).totals()
 
 # ===========================
 # ROSTER LOOKUP (RepId -> Manager / RepName)
 # ===========================
-_ROSTER_CACHE = {"ts": 0, "map": {}}
+# Stale-while-revalidate: lookups always get the current map straight away, and
+# roster_refresh_loop replaces it in the background shortly before it expires.
+# Only the very first load (before the loop has warmed it) waits on Sheets.
+_ROSTER_CACHE = {"ts": 0, "index": None, "used": 0, "task": None, "version": 0}
 _ROSTER_TTL_SECONDS = 120  # refresh every 2 minutes
+_ROSTER_REFRESH_AHEAD_SECONDS = 30  # background refresh this long before expiry
+_ROSTER_IDLE_SECONDS = 600  # stop refreshing once nothing has read the roster for this long
 
 def _now_unix():
     return int(datetime.now(timezone.utc).timestamp())
 
 def fetch_roster_rows():
-    resp = sheet_api.get(
+    resp = sheets_scheduler.execute(get_sheet_api().get(
         spreadsheetId=GOOGLE_SHEET_ID,
         range=ROSTER_RANGE
-    ).execute()
+    ))
     return resp.get("values", [])
 
+def fetch_sales_and_roster_rows():
+    """Sheet1 and Roster in one batchGet round trip -> (sales values, roster values)."""
+    resp = sheets_scheduler.execute(get_sheet_api().batchGet(
+        spreadsheetId=GOOGLE_SHEET_ID,
+        ranges=[SHEET_RANGE, ROSTER_RANGE]
+    ))
+    sales, roster = (vr.get("values", []) for vr in resp.get("valueRanges", [{}, {}]))
+    return sales, roster
+
 def build_roster_map(values):
     """
     Returns dict:
@@ -320,40 +1078,1177 @@ def build_roster_map(values):
 
     return out
 
-def get_roster_map_cached():
+class RosterIndex:
+    """
+    Read-only lookups derived once per roster refresh. Rep ids are str, the same keys
+    the sales counts use, so leaderboards can look names up without converting.
+
+      roster   rep_id(int) -> info, as returned by build_roster_map
+      by_id    rep_id(str) -> info
+      names    rep_id(str) -> RepName (blank names left out)
+      active   frozenset of active rep_id(str)
+    """
+
+    def __init__(self, roster: dict):
+        by_id = {str(rep_id): info for rep_id, info in roster.items()}
+        names = {}
+        for rep_id, info in by_id.items():
+            name = (info.get("rep_name") or "").strip()
+            if name:
+                names[rep_id] = name
+
+        self.roster = MappingProxyType(dict(roster))
+        self.by_id = MappingProxyType(by_id)
+        self.names = MappingProxyType(names)
+        self.active = frozenset(rep_id for rep_id, info in by_id.items() if info.get("active", True))
+
+def store_roster(values) -> RosterIndex:
+    """Install a fresh Roster read as the cached index."""
+    roster = build_roster_map(values)
+    current = _ROSTER_CACHE["index"]
+    _ROSTER_CACHE["ts"] = _now_unix()
+    if current is not None and current.roster == roster:
+        return current  # unchanged: keep the index (and version) that cached renders were keyed on
+    index = RosterIndex(roster)
+    _ROSTER_CACHE["index"] = index
+    _ROSTER_CACHE["version"] += 1
+    return index
+
+async def _refresh_roster():
+    return store_roster(await fetch_roster_rows_async())
+
+def _roster_refresh_done(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        e = task.exception()
+        print(f"Roster refresh failed: {type(e).__name__}: {e}")
+
+def _start_roster_refresh():
+    """The in-flight roster refresh, starting one if none is running."""
+    task = _ROSTER_CACHE["task"]
+    if task is None or task.done():
+        task = _ROSTER_CACHE["task"] = asyncio.create_task(_refresh_roster())
+        task.add_done_callback(_roster_refresh_done)
+    return task
+
+async def get_roster_index() -> RosterIndex:
+    now = _now_unix()
+    _ROSTER_CACHE["used"] = now
+    if _ROSTER_CACHE["index"] is not None:
+        if now - _ROSTER_CACHE["ts"] >= _ROSTER_TTL_SECONDS:
+            _start_roster_refresh()  # serve what we have; the fresh index lands shortly
+        return _ROSTER_CACHE["index"]
+    return await asyncio.shield(_start_roster_refresh())
+
+async def roster_refresh_loop():
+    """
+    Keep the roster fresh while anything is still reading it. Startup warming comes from
+    the combined Sheet1 + Roster read (refresh_sales_and_roster) in the mirror loop.
+    """
+    while True:
+        now = _now_unix()
+        due = now - _ROSTER_CACHE["ts"] >= _ROSTER_TTL_SECONDS - _ROSTER_REFRESH_AHEAD_SECONDS
+        in_use = now - _ROSTER_CACHE["used"] < _ROSTER_IDLE_SECONDS
+        if due and in_use and not sheets_scheduler.read_headroom_low():
+            try:
+                await asyncio.shield(_start_roster_refresh())
+            except Exception:
+                pass  # reported by _roster_refresh_done; the last good map stays in service
+        await asyncio.sleep(_ROSTER_REFRESH_AHEAD_SECONDS / 2)
+
+async def lookup_manager_for_rep(rep_id: int):
+    index = await get_roster_index()
+    rep_key = str(rep_id)
+    if rep_key not in index.active:
+        return None
+    return index.by_id[rep_key].get("manager")
+
+async def get_rep_name_map():
+    """RepId(str) -> RepName map from Roster only (fast + stable). Read-only; shared by every caller."""
+    return (await get_roster_index()).names
+
+# ===========================
+# /sale PREFETCH
+# ===========================
+# /sale leaves several seconds of typing and clicking before PlanSelect needs the rep's
+# manager and the live counters. The lookup starts as soon as the modal opens, keyed by
+# user id, and PlanSelect picks up its result instead of doing the reads itself.
+_SALE_PREFETCH = {}  # user_id -> (started_at, task resolving to the rep's manager or None)
+
+async def _prefetch_sale_context(user_id: int):
+    manager = await lookup_manager_for_rep(user_id)
+    await get_sales_aggregate()  # hydrated counters make the confirmation count a dict lookup
+    return manager
+
+def _sale_prefetch_done(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()  # consumed here; manager_for_sale falls back to a fresh lookup
+
+def prefetch_sale_context(user_id: int):
+    """Start warming the rep's roster entry and counts in the background."""
     now = _now_unix()
-    if _ROSTER_CACHE["map"] and (now - _ROSTER_CACHE["ts"] < _ROSTER_TTL_SECONDS):
-        return _ROSTER_CACHE["map"]
+    for uid, (started, _) in list(_SALE_PREFETCH.items()):
+        if now - started >= _ROSTER_TTL_SECONDS:  # abandoned flows
+            del _SALE_PREFETCH[uid]
+    task = asyncio.create_task(_prefetch_sale_context(user_id))
+    task.add_done_callback(_sale_prefetch_done)
+    _SALE_PREFETCH[user_id] = (now, task)
+
+def sale_manager_ready() -> bool:
+    """Whether manager_for_sale will answer from memory, without waiting on Sheets."""
+    return _ROSTER_CACHE["index"] is not None
+
+async def manager_for_sale(user_id: int):
+    """
+    The rep's manager for a sale being logged: straight from the roster index once it is
+    loaded, else from the prefetch that is loading it (if recent), else a lookup.
+    """
+    entry = _SALE_PREFETCH.pop(user_id, None)
+    if sale_manager_ready():
+        return await lookup_manager_for_rep(user_id)
+    if entry and _now_unix() - entry[0] < _ROSTER_TTL_SECONDS:
+        try:
+            return await entry[1]
+        except Exception:
+            pass
+    return await lookup_manager_for_rep(user_id)
 
-    values = fetch_roster_rows()
-    m = build_roster_map(values)
+# ===========================
+# ASYNC SHEETS GATEWAY
+# ===========================
+# Every Sheets round trip from a Discord handler goes through here. The blocking
+# googleapiclient call runs on a bounded worker pool (one HTTP client per worker),
+# so a slow Sheets response only parks the awaiting handler, not the whole bot.
+_SHEETS_EXECUTOR = ThreadPoolExecutor(max_workers=SHEETS_MAX_WORKERS, thread_name_prefix="sheets")
+# Sale appends get a worker of their own, so reads waiting on quota can't hold them up.
+_SHEETS_WRITE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets-write")
+
+async def run_sheets_call(fn, *args, **kwargs):
+    """Run a blocking Sheets helper on the Sheets worker pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_SHEETS_EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+async def run_sheets_write(fn, *args, **kwargs):
+    """Like run_sheets_call, on the dedicated write worker."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_SHEETS_WRITE_EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+async def append_sale_to_sheet_async(rep_id: int, rep_name: str, manager: str, customer: str, isp: str, plan: str, submission_id: str):
+    """
+    Log one sale locally and queue it for Sheet1; returns once the local log has it.
+    Returns [] if this submission_id was already logged.
+    """
+    return await sale_append_queue.submit([build_sale_row(rep_id, rep_name, manager, customer, isp, plan, submission_id)])
 
-    _ROSTER_CACHE["ts"] = now
-    _ROSTER_CACHE["map"] = m
-    return m
+async def append_sales_batch_to_sheet_async(rows: list[list[str]]):
+    """
+    Log a block of rows locally and queue them for Sheet1; returns once the local log has them.
+    Rows whose SubmissionId was already logged are dropped (and get no sequence number).
+    """
+    return await sale_append_queue.submit(rows)
 
-def lookup_manager_for_rep(rep_id: int):
-    info = get_roster_map_cached().get(rep_id)
-    if not info:
+async def fetch_roster_rows_async():
+    return await run_sheets_call(fetch_roster_rows)
+
+async def refresh_sales_and_roster(*, rebuild: bool = False):
+    """
+    One batchGet for Sheet1 + Roster that fills the roster cache and the mirror (as its
+    full read + checksum pass, or a forced rebuild). Used for the first sync at startup
+    and by /reset, where both are needed anyway.
+    """
+    sales_values, roster_values = await run_sheets_call(fetch_sales_and_roster_rows)
+    store_roster(roster_values)
+    if rebuild:
+        forget_archive_totals()  # re-read the Aggregates tab too
+        sales_sheet_tail.request_full_read(rebuild=True)
+    await reconcile_sales_mirror(full_values=sales_values)
+
+# ===========================
+# LOCAL SALE LOG (WRITE-AHEAD)
+# ===========================
+# Every sale is committed to a local SQLite log before anything touches Sheets.
+# That commit is the rep's receipt; the append queue below replays the log to
+# Sheet1 in order and marks entries confirmed once Sheets acknowledges them.
+# Point SALES_DB_PATH at persistent storage so unshipped sales survive restarts.
+SALES_DB_PATH = os.getenv("SALES_DB_PATH", "salesbison.db")
+
+WAL_PENDING = 0     # durable locally, not sent yet
+WAL_SENDING = 1     # handed to values.append, outcome unknown until it returns
+WAL_CONFIRMED = 2   # Sheets acknowledged the append
+
+def _row_key(row):
+    """Comparable form of a Sheet1 row (Sheets drops trailing empty cells)."""
+    cells = [str(c) for c in row]
+    while cells and cells[-1] == "":
+        cells.pop()
+    return tuple(cells)
+
+_SALES_DB = {"conn": None}
+_MIRROR_SCHEMA_VERSION = 5
+
+def sales_db():
+    """
+    Shared SQLite connection for the sale log and the Sheet1 mirror.
+    Only ever used from the sales-db worker thread (see run_db_call).
+    """
+    if _SALES_DB["conn"] is None:
+        conn = sqlite3.connect(SALES_DB_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        (schema_version,) = conn.execute("PRAGMA user_version").fetchone()
+        if schema_version != _MIRROR_SCHEMA_VERSION:
+            # The mirror is a disposable cache of Sheet1; rebuild it from scratch on schema changes.
+            conn.execute("DROP TABLE IF EXISTS sales")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sale_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                row_json TEXT NOT NULL,
+                state INTEGER NOT NULL DEFAULT 0,
+                created_at INTEGER NOT NULL,
+                confirmed_at INTEGER,
+                submission_id TEXT
+            );
+            CREATE INDEX IF NOT EXISTS sale_log_state ON sale_log(state, seq);
+
+            CREATE TABLE IF NOT EXISTS sales (
+                id INTEGER PRIMARY KEY,
+                seq INTEGER,
+                sheet_row INTEGER,
+                ts TEXT,
+                day_key INTEGER,
+                month_key INTEGER,
+                rep_id TEXT NOT NULL,
+                rep_name TEXT NOT NULL,
+                manager TEXT NOT NULL,
+                customer TEXT NOT NULL,
+                isp TEXT NOT NULL,
+                plan TEXT NOT NULL,
+                is_dealer INTEGER NOT NULL,
+                submission_id TEXT,
+                quantity INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS sales_ts ON sales(ts);
+            CREATE INDEX IF NOT EXISTS sales_day ON sales(day_key);
+            CREATE INDEX IF NOT EXISTS sales_rep ON sales(rep_id, day_key);
+            CREATE INDEX IF NOT EXISTS sales_manager ON sales(manager, day_key);
+            CREATE INDEX IF NOT EXISTS sales_seq ON sales(seq);
+            CREATE UNIQUE INDEX IF NOT EXISTS sales_sheet_row ON sales(sheet_row);
+            CREATE UNIQUE INDEX IF NOT EXISTS sales_submission ON sales(submission_id) WHERE submission_id IS NOT NULL;
+
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+
+            CREATE TABLE IF NOT EXISTS live_boards (
+                message_id INTEGER PRIMARY KEY,
+                channel_id INTEGER NOT NULL,
+                board TEXT NOT NULL,
+                mode TEXT NOT NULL
+            );
+            """
+        )
+        # The sale log is durable and never dropped: logs from before submission ids get the column added.
+        if "submission_id" not in [col[1] for col in conn.execute("PRAGMA table_info(sale_log)")]:
+            conn.execute("ALTER TABLE sale_log ADD COLUMN submission_id TEXT")
+        # Recent-id index: a submission that is already in the log is never logged (or shipped) twice.
+        conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS sale_log_submission ON sale_log(submission_id) "
+            "WHERE submission_id IS NOT NULL"
+        )
+        if schema_version != _MIRROR_SCHEMA_VERSION:
+            conn.execute("DELETE FROM meta WHERE key IN ('mirror_reconciled_at', 'mirror_revision')")
+            conn.execute(f"PRAGMA user_version = {_MIRROR_SCHEMA_VERSION}")
+        conn.commit()
+        _SALES_DB["conn"] = conn
+    return _SALES_DB["conn"]
+
+def close_sales_db():
+    if _SALES_DB["conn"] is not None:
+        _SALES_DB["conn"].close()
+        _SALES_DB["conn"] = None
+
+class SaleLog:
+    """Append-only log of sale rows in the shared sales db."""
+
+    def append(self, rows: list[list[str]]) -> list[int]:
+        """
+        Durably log rows and add them to the mirror (one transaction). Returns the sequence
+        numbers of the rows that were new; rows whose SubmissionId is already logged are dropped.
+        """
+        now = _now_unix()
+        seqs, logged = [], []
+        with sales_mirror.transaction() as db:
+            for row in rows:
+                cur = db.execute(
+                    "INSERT OR IGNORE INTO sale_log (row_json, state, created_at, submission_id) VALUES (?, ?, ?, ?)",
+                    (json.dumps(list(_row_key(row))), WAL_PENDING, now, _submission_id(row)),
+                )
+                if cur.rowcount:
+                    seqs.append(cur.lastrowid)
+                    logged.append(row)
+            sales_mirror.add_rows(db, logged, seqs)
+        return seqs
+
+    def claim_pending(self, limit: int):
+        """Oldest pending entries, flipped to SENDING. Returns [(seq, row)]."""
+        db = sales_db()
+        with db:
+            found = db.execute(
+                "SELECT seq, row_json FROM sale_log WHERE state = ? ORDER BY seq LIMIT ?",
+                (WAL_PENDING, limit),
+            ).fetchall()
+            db.executemany("UPDATE sale_log SET state = ? WHERE seq = ?", [(WAL_SENDING, seq) for seq, _ in found])
+        return [(seq, json.loads(row_json)) for seq, row_json in found]
+
+    def mark_pending(self, seqs: list[int]):
+        db = sales_db()
+        with db:
+            db.executemany("UPDATE sale_log SET state = ? WHERE seq = ?", [(WAL_PENDING, seq) for seq in seqs])
+
+    def confirm(self, seqs: list[int], sheet_rows: list):
+        """
+        Mark entries confirmed and pin their mirror rows to the sheet rows they landed on,
+        dropping any copy a tail sync already pulled in for those rows.
+        """
+        now = _now_unix()
+        with sales_mirror.transaction() as db:
+            db.executemany(
+                "UPDATE sale_log SET state = ?, confirmed_at = ? WHERE seq = ?",
+                [(WAL_CONFIRMED, now, seq) for seq in seqs],
+            )
+            for seq, sheet_row in zip(seqs, sheet_rows):
+                if sheet_row is None:
+                    continue
+                sales_mirror.remove_sheet_copy(db, sheet_row)
+                db.execute("UPDATE sales SET sheet_row = ? WHERE seq = ?", (sheet_row, seq))
+
+    def in_flight(self):
+        """Entries whose append outcome is unknown (we stopped mid-send). Returns [(seq, row)]."""
+        found = sales_db().execute(
+            "SELECT seq, row_json FROM sale_log WHERE state = ? ORDER BY seq", (WAL_SENDING,)
+        ).fetchall()
+        return [(seq, json.loads(row_json)) for seq, row_json in found]
+
+    def confirmed_counts(self, keys):
+        """row_key -> how many confirmed entries carry exactly that row."""
+        db = sales_db()
+        out = {}
+        for key in set(keys):
+            (n,) = db.execute(
+                "SELECT COUNT(*) FROM sale_log WHERE state = ? AND row_json = ?",
+                (WAL_CONFIRMED, json.dumps(list(key))),
+            ).fetchone()
+            out[key] = n
+        return out
+
+    def unconfirmed(self, seqs) -> set:
+        """The subset of seqs Sheets hasn't acknowledged yet."""
+        db = sales_db()
+        return {
+            seq for seq in seqs
+            if db.execute("SELECT 1 FROM sale_log WHERE seq = ? AND state != ?", (seq, WAL_CONFIRMED)).fetchone()
+        }
+
+    def unconfirmed_count(self) -> int:
+        (n,) = sales_db().execute("SELECT COUNT(*) FROM sale_log WHERE state != ?", (WAL_CONFIRMED,)).fetchone()
+        return n
+
+    def confirmed_through(self) -> int:
+        """Highest seq such that it and every entry before it are confirmed."""
+        db = sales_db()
+        (first_open,) = db.execute("SELECT MIN(seq) FROM sale_log WHERE state != ?", (WAL_CONFIRMED,)).fetchone()
+        if first_open is not None:
+            return first_open - 1
+        (last,) = db.execute("SELECT MAX(seq) FROM sale_log").fetchone()
+        return last or 0
+
+# SQLite work runs on its own single worker: one connection, strictly ordered writes.
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sales-db")
+
+async def run_db_call(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_DB_EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+sale_log = SaleLog()
+
+# ===========================
+# SALES MIRROR (local read model of Sheet1)
+# ===========================
+# A SQLite copy of Sheet1 that every count and leaderboard reads from. Sales we log
+# ourselves land in it in the same transaction as the sale log entry (tagged with
+# their log seq, later pinned to the sheet row they landed on). A periodic reconcile
+# applies new Sheet1 rows from the tail sync, and rebuilds from a full read only
+# when the checksum pass saw hand edits.
+SALES_MIRROR_RECONCILE_SECONDS = int(os.getenv("SALES_MIRROR_RECONCILE_SECONDS", "60"))
+
+_REP_KEY_SQL = "CASE WHEN rep_id != '' THEN rep_id ELSE rep_name END"
+_MANAGER_KEY_SQL = "CASE WHEN manager != '' THEN manager ELSE 'Unassigned' END"
+
+def _submission_id(row):
+    """Column H, or None for rows logged before submission ids (and hand-entered ones)."""
+    return (str(row[7]).strip() or None) if len(row) >= 8 else None
+
+def _quantity(row) -> int:
+    """Column I; blank or unreadable means one sale (every row before the column existed)."""
+    cell = str(row[8]).strip() if len(row) >= 9 else ""
+    try:
+        return max(int(cell), 1) if cell else 1
+    except ValueError:
+        return 1
+
+def _mirror_record(row, seq=None, sheet_row=None):
+    """Sheet1 row -> sales table tuple, or None for rows compute_counts would skip anyway."""
+    if len(row) < 4:
         return None
-    if not info.get("active", True):
+    decoded = decode_et_timestamp(str(row[0]))
+    day, month, ts = decoded if decoded else (None, None, None)
+    customer = str(row[4]).strip() if len(row) >= 5 else ""
+    return (
+        seq,
+        sheet_row,
+        ts,
+        day,
+        month,
+        str(row[1]).strip(),
+        str(row[2]).strip(),
+        str(row[3]).strip(),
+        customer,
+        str(row[5]).strip() if len(row) >= 6 else "",
+        str(row[6]).strip() if len(row) >= 7 else "",
+        1 if customer.lower() == "dealer" else 0,
+        _submission_id(row),
+        _quantity(row),
+    )
+
+# OR IGNORE: a row whose sheet_row or SubmissionId is already in the mirror is the same sale.
+_INSERT_SALES_SQL = (
+    "INSERT OR IGNORE INTO sales "
+    "(seq, sheet_row, ts, day_key, month_key, rep_id, rep_name, manager, customer, isp, plan, is_dealer, submission_id, quantity) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+class SalesMirror:
+    """
+    Queries and maintenance for the sales table. Sales-db worker thread only.
+    version is bumped on every write so readers on the loop can tell when cached results are stale.
+    counters is the live SalesAggregate and columns the ColumnarSales it was hydrated from
+    (both None until hydrated, or after a failed write). day_index is built from columns
+    on the first date-range query.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.counters = None
+        self.columns = None
+        self.day_index = None
+
+    def _drop_counts(self):
+        self.counters = None
+        self.columns = None
+        self.day_index = None
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction on the shared db; counters are dropped if it rolls back."""
+        db = sales_db()
+        try:
+            with db:
+                yield db
+                # Any change to the table invalidates a warm-start snapshot of the columns.
+                db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('mirror_revision', ?)",
+                    (uuid.uuid4().hex,),
+                )
+        except Exception:
+            self._drop_counts()
+            raise
+        finally:
+            self.version += 1
+
+    def apply_counts(self, records, delta: int):
+        if self.counters is None:
+            return
+        for rec in records:
+            _, _, _, day, month, rep_id, rep_name, manager, _, isp, plan, is_dealer, _, quantity = rec
+            if day is None:
+                continue
+            rep_key, manager_key = rep_id or rep_name, manager or "Unassigned"
+            self.counters.apply(rep_key, manager_key, bool(is_dealer), day, month, delta * quantity)
+            self.columns.add(day, rep_key, manager_key, isp, plan, bool(is_dealer), delta * quantity)
+
+    def add_rows(self, db, rows, seqs=None, sheet_rows=None):
+        """Insert rows inside the caller's transaction and count the ones that weren't already there."""
+        seqs = seqs or [None] * len(rows)
+        sheet_rows = sheet_rows or [None] * len(rows)
+        records = [rec for rec in map(_mirror_record, rows, seqs, sheet_rows) if rec]
+        records = [rec for rec in records if db.execute(_INSERT_SALES_SQL, rec).rowcount]
+        self.apply_counts(records, +1)
+
+    def remove_sheet_copy(self, db, sheet_row: int):
+        """Drop a tail-synced copy of a sheet row that one of our own sales turned out to be."""
+        found = db.execute(
+            "SELECT seq, sheet_row, ts, day_key, month_key, rep_id, rep_name, manager, customer, isp, plan, is_dealer, submission_id, quantity "
+            "FROM sales WHERE sheet_row = ? AND seq IS NULL",
+            (sheet_row,),
+        ).fetchall()
+        if found:
+            db.execute("DELETE FROM sales WHERE sheet_row = ? AND seq IS NULL", (sheet_row,))
+            self.apply_counts(found, -1)
+
+    def replace_from_sheet(self, numbered_rows, since_seq: int, archived_rows=()):
+        """
+        Rebuild from a full Sheet1 read [(sheet_row, row)] that started after every log entry
+        <= since_seq was confirmed. Locally logged rows newer than that stay as they are; their
+        copies in the read (if they had already landed) are skipped so nothing is counted twice.
+        archived_rows are the rolled-over periods' per-day totals (see archived_sale_rows).
+        """
+        last_row = numbered_rows[-1][0] if numbered_rows else 0
+        with self.transaction() as db:
+            local = db.execute("SELECT row_json FROM sale_log WHERE seq > ?", (since_seq,)).fetchall()
+            skip = {}
+            for (row_json,) in local:
+                k = tuple(json.loads(row_json))
+                skip[k] = skip.get(k, 0) + 1
+
+            keep = []
+            for sheet_row, row in numbered_rows:
+                k = _row_key(row)
+                if skip.get(k, 0) > 0:
+                    skip[k] -= 1
+                    continue
+                keep.append((sheet_row, row))
+
+            db.execute("DELETE FROM sales WHERE seq IS NULL OR seq <= ?", (since_seq,))
+            # Row numbers inside the read may have shifted under hand edits or a rollover; the read is
+            # authoritative there. Rows with a SubmissionId don't need a pin to be recognised.
+            db.execute("UPDATE sales SET sheet_row = NULL WHERE sheet_row <= ? OR submission_id IS NOT NULL", (last_row,))
+            self._drop_counts()
+            self.add_rows(db, [row for _, row in keep], sheet_rows=[n for n, _ in keep])
+            self.add_rows(db, archived_rows)
+        self.rehydrate()
+
+    def apply_tail(self, numbered_rows):
+        """
+        Add newly seen Sheet1 rows. Rows already pinned to one of our own sales, and repeats of a
+        SubmissionId we already have (a retried append that landed twice), are left alone.
+        """
+        with self.transaction() as db:
+            self.add_rows(db, [row for _, row in numbered_rows], sheet_rows=[n for n, _ in numbered_rows])
+
+    def has_sheet_rows_before(self, day: int) -> bool:
+        """Whether Sheet1 (as last synced) still holds sales stamped before day (a day_key)."""
+        return sales_db().execute(
+            "SELECT 1 FROM sales WHERE sheet_row IS NOT NULL AND day_key < ? LIMIT 1", (day,)
+        ).fetchone() is not None
+
+    def mark_reconciled(self):
+        db = sales_db()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('mirror_reconciled_at', ?)",
+                (str(_now_unix()),),
+            )
+
+    def revision(self):
+        """Token that changes with every write to the table (None for a fresh mirror)."""
+        found = sales_db().execute("SELECT value FROM meta WHERE key = 'mirror_revision'").fetchone()
+        return found[0] if found else None
+
+    def last_reconciled(self):
+        found = sales_db().execute("SELECT value FROM meta WHERE key = 'mirror_reconciled_at'").fetchone()
+        return int(found[0]) if found else 0
+
+    def rehydrate(self) -> SalesAggregate:
+        """Reload the columnar copy and rebuild the live counters from it (first use, full rebuilds, /reset)."""
+        self.columns = ColumnarSales.load(sales_db())
+        self.day_index = None
+        self.counters = self.columns.aggregate(datetime.now(ET).date())
+        return self.counters
+
+    def hydrated(self) -> SalesAggregate:
+        """The live counters, rebuilt only if nobody queued ahead of us already did."""
+        return self.counters if self.counters is not None else self.rehydrate()
+
+    def range_counts(self, first: date, last: date, key: str = "rep", exclude_dealer_rows: bool = False):
+        if self.columns is None:
+            self.rehydrate()
+        if self.day_index is None:
+            self.day_index = DayBucketIndex(self.columns)
+        self.day_index.sync()
+        return self.day_index.counts(first, last, key=key, exclude_dealer_rows=exclude_dealer_rows)
+
+    def board_counts(self, boards, as_of: date = None):
+        """
+        Every TIMEFRAMES mode for each (key, exclude_dealer_rows) in boards, in one pass, seen
+        from as_of (today when None). Returns (version, {(mode, key, exclude_dealer_rows): counts}).
+        """
+        today = datetime.now(ET).date()
+        counters = self.hydrated()
+        counters.roll_to(today)
+        out = {}
+        for mode in TIMEFRAMES:
+            for key, excl in boards:
+                if as_of is None and mode in COUNT_MODES:
+                    out[(mode, key, excl)] = counters.counts(mode, key=key, exclude_dealer_rows=excl)
+                else:
+                    first, last = timeframe_range(mode, as_of or today)
+                    out[(mode, key, excl)] = self.range_counts(first, last, key, excl)
+        return self.version, out
+
+sales_mirror = SalesMirror()
+
+_MIRROR_SYNC = {"ready": False, "task": None}
+
+async def _reconcile_sales_mirror(full_values=None):
+    since_seq = await run_db_call(sale_log.confirmed_through)
+    _, rebuilt, numbered = await run_sheets_call(sales_sheet_tail.sync, full_values)
+    try:
+        if rebuilt:
+            archived = await get_archived_sale_rows()
+            await run_db_call(sales_mirror.replace_from_sheet, numbered, since_seq, archived)
+        elif numbered:
+            await run_db_call(sales_mirror.apply_tail, numbered)
+    except Exception:
+        # The cursor already moved past these rows; only a rebuild can bring them back.
+        sales_sheet_tail.request_full_read(rebuild=True)
+        raise
+    await run_db_call(sales_mirror.mark_reconciled)
+    _MIRROR_SYNC["ready"] = True
+
+async def reconcile_sales_mirror(full_values=None):
+    """
+    Tail-sync Sheet1 and feed the mirror. New rows are applied incrementally; a full
+    rebuild only happens on first sync or when the checksum pass detected edits above the tail.
+    Concurrent callers share the pass already in flight, unless they bring their own full
+    read (full_values), which runs as a fresh pass once the current one is done.
+    """
+    task = _MIRROR_SYNC["task"]
+    if full_values is not None and task is not None and not task.done():
+        await asyncio.wait([task])
+        task = _MIRROR_SYNC["task"]
+    if task is None or task.done():
+        task = _MIRROR_SYNC["task"] = asyncio.create_task(_reconcile_sales_mirror(full_values))
+    await asyncio.shield(task)
+
+async def ensure_sales_mirror():
+    """Block only on the very first sync of an empty mirror; concurrent callers share it."""
+    if _MIRROR_SYNC["ready"]:
+        return
+    if await run_db_call(sales_mirror.last_reconciled):
+        _MIRROR_SYNC["ready"] = True
+        return
+    await reconcile_sales_mirror()
+
+async def resync_sales():
+    """
+    Full Sheet1 read and mirror rebuild, which also re-hydrates the live counters.
+    The Roster comes back in the same round trip and replaces the cached one.
+    """
+    await refresh_sales_and_roster(rebuild=True)
+
+async def sales_mirror_reconcile_loop():
+    first = not _WARM_START["restored"]
+    while True:
+        try:
+            if first:
+                await refresh_sales_and_roster()  # warms the roster in the same round trip
+            elif not sheets_scheduler.read_headroom_low():
+                await reconcile_sales_mirror()  # otherwise counts keep serving from the mirror
+            first = False
+            await get_sales_aggregate()  # hydrate the live counters up front
+        except Exception as e:
+            print(f"Sales mirror reconcile failed: {type(e).__name__}: {e}")
+        await asyncio.sleep(SALES_MIRROR_RECONCILE_SECONDS)
+
+# ===========================
+# WARM START SNAPSHOT
+# ===========================
+# The mirror itself is already on disk, but a restart used to forget the sync cursor and the
+# roster, so the first sync after every deploy was a full Sheet1 + Roster download. Every
+# SALES_WARM_SNAPSHOT_SECONDS and on shutdown we write the roster map, the Sheet1 cursor
+# (per-row CRCs) and the columnar copy of the mirror to one zlib-compressed file next to the
+# database. setup_hook loads it before the gateway connects, so the first sync is a tail read.
+# The cursor and columns are only trusted if the mirror hasn't been written since (revision).
+SALES_WARM_SNAPSHOT_PATH = os.getenv("SALES_WARM_SNAPSHOT_PATH", f"{SALES_DB_PATH}.warm")
+SALES_WARM_SNAPSHOT_SECONDS = int(os.getenv("SALES_WARM_SNAPSHOT_SECONDS", "300"))
+_WARM_SNAPSHOT_FORMAT = 1
+
+_WARM_START = {"restored": False}
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+def write_warm_snapshot(roster, tail_state):
+    """Sales-db worker thread. roster and tail_state were captured on the loop just before."""
+    snapshot = {
+        "format": _WARM_SNAPSHOT_FORMAT,
+        "schema": _MIRROR_SCHEMA_VERSION,
+        "saved_at": time.time(),
+        "revision": sales_mirror.revision(),
+        "roster": None,
+        "tail": None,
+        "columns": None,
+    }
+    if roster is not None:
+        snapshot["roster"] = {"ts": roster[0], "reps": [[rep_id, dict(info)] for rep_id, info in roster[1].items()]}
+    if tail_state is not None:
+        snapshot["tail"] = {"crcs": _b64(tail_state["crcs"]), "checksum_age": tail_state["checksum_age"]}
+    if sales_mirror.columns is not None:
+        state = sales_mirror.columns.to_state()
+        state["buffers"] = {name: _b64(buf) for name, buf in state["buffers"].items()}
+        snapshot["columns"] = state
+
+    tmp = f"{SALES_WARM_SNAPSHOT_PATH}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(json.dumps(snapshot, separators=(",", ":")).encode("utf-8")))
+    os.replace(tmp, SALES_WARM_SNAPSHOT_PATH)
+
+async def save_warm_snapshot() -> bool:
+    """
+    Capture and write the snapshot. Skipped (False) while a mirror sync is in flight, since
+    the cursor may already be past rows the mirror hasn't taken yet.
+    """
+    task = _MIRROR_SYNC["task"]
+    if task is not None and not task.done():
+        return False
+    index = _ROSTER_CACHE["index"]
+    roster = (_ROSTER_CACHE["ts"], index.roster) if index is not None else None
+    # No await between capturing the cursor and queueing the write: nothing can reach the mirror in between.
+    await run_db_call(write_warm_snapshot, roster, sales_sheet_tail.export_state())
+    return True
+
+def read_warm_snapshot():
+    """Sales-db worker thread. The parsed snapshot with columns restored, or None if unusable."""
+    try:
+        with open(SALES_WARM_SNAPSHOT_PATH, "rb") as f:
+            snapshot = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+    except FileNotFoundError:
+        return None
+    if snapshot.get("format") != _WARM_SNAPSHOT_FORMAT or snapshot.get("schema") != _MIRROR_SCHEMA_VERSION:
+        return None
+    revision = sales_mirror.revision()
+    if revision is None or snapshot.get("revision") != revision:
+        # The mirror moved on after the snapshot (or was dropped); only the roster still holds.
+        snapshot["tail"] = snapshot["columns"] = None
+    if snapshot["columns"] is not None:
+        state = snapshot["columns"]
+        state["buffers"] = {name: base64.b64decode(buf) for name, buf in state["buffers"].items()}
+        sales_mirror.columns = ColumnarSales.from_state(state)
+        sales_mirror.day_index = None
+        sales_mirror.counters = sales_mirror.columns.aggregate(datetime.now(ET).date())
+    if snapshot["tail"] is not None:
+        snapshot["tail"]["crcs"] = base64.b64decode(snapshot["tail"]["crcs"])
+    return snapshot
+
+async def load_warm_snapshot():
+    """Restore the roster, Sheet1 cursor and live counters from the last snapshot, if any."""
+    try:
+        snapshot = await run_db_call(read_warm_snapshot)
+    except Exception as e:
+        print(f"Warm-start snapshot unreadable, starting cold: {type(e).__name__}: {e}")
+        return
+    if snapshot is None:
+        return
+    if snapshot["roster"] is not None and _ROSTER_CACHE["index"] is None:
+        roster = {int(rep_id): info for rep_id, info in snapshot["roster"]["reps"]}
+        _ROSTER_CACHE["index"] = RosterIndex(roster)
+        _ROSTER_CACHE["version"] += 1
+        _ROSTER_CACHE["ts"] = snapshot["roster"]["ts"]  # past its TTL -> first use refreshes in the background
+    if snapshot["tail"] is not None:
+        sales_sheet_tail.restore(snapshot["tail"], time.time() - snapshot["saved_at"])
+        _WARM_START["restored"] = True
+    print(
+        f"Warm start: roster {'restored' if snapshot['roster'] else 'cold'}, "
+        f"Sheet1 cursor {'restored' if snapshot['tail'] else 'cold'}, "
+        f"{len(sales_mirror.columns) if snapshot['columns'] else 0} columnar rows."
+    )
+
+async def warm_snapshot_loop():
+    while True:
+        await asyncio.sleep(SALES_WARM_SNAPSHOT_SECONDS)
+        try:
+            await save_warm_snapshot()
+        except Exception as e:
+            print(f"Warm-start snapshot failed: {type(e).__name__}: {e}")
+
+# ===========================
+# SHEET1 ARCHIVE ROLLOVER
+# ===========================
+# Keeps Sheet1 small. Closed months are moved out of it into "Archive YYYY-MM" tabs, and
+# their per-day, per-rep totals are written to the Aggregates tab, all in one atomic
+# batchUpdate. The mirror loads those totals back as weighted rows (Quantity), so counts,
+# /totals and every leaderboard see archived months exactly as before the move.
+# Runs from /archive, or on a timer when SHEET_ARCHIVE_AUTO=1.
+ARCHIVE_TAB_PREFIX = "Archive "
+AGGREGATES_TAB = "Aggregates"
+AGGREGATES_RANGE = f"{AGGREGATES_TAB}!A:G"
+# Aggregates columns: Day | RepId | RepName | Manager | Dealer | Quantity | Period
+AGGREGATES_HEADER = ["Day", "RepId", "RepName", "Manager", "Dealer", "Quantity", "Period"]
+SHEET_ARCHIVE_KEEP_MONTHS = int(os.getenv("SHEET_ARCHIVE_KEEP_MONTHS", "1"))  # full months kept besides the current one
+SHEET_ARCHIVE_AUTO = os.getenv("SHEET_ARCHIVE_AUTO", "0") == "1"
+SHEET_ARCHIVE_CHECK_SECONDS = int(os.getenv("SHEET_ARCHIVE_CHECK_SECONDS", "21600"))
+
+_ARCHIVE_TOTALS = {"rows": None, "generation": 0}
+_ROLLOVER = {"running": False}
+
+def archive_cutoff(today: date, keep_months: int = SHEET_ARCHIVE_KEEP_MONTHS) -> date:
+    """First day still kept in Sheet1: the start of the month keep_months before today's."""
+    months = today.year * 12 + today.month - 1 - max(keep_months, 0)
+    return date(months // 12, months % 12 + 1, 1)
+
+def _day_text(key: int) -> str:
+    return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+
+def fetch_archive_aggregates():
+    """Aggregates tab values, header excluded ([] until the first rollover creates it)."""
+    try:
+        resp = sheets_scheduler.execute(get_sheet_api().get(spreadsheetId=GOOGLE_SHEET_ID, range=AGGREGATES_RANGE))
+    except HttpError as e:
+        if getattr(e.resp, "status", 0) == 400:  # no such tab yet
+            return []
+        raise
+    values = resp.get("values", [])
+    return values[1:] if values and str(values[0][0]).strip().lower() == "day" else values
+
+def archived_sale_rows(aggregates):
+    """Aggregates rows -> Sheet1-shaped rows (midnight timestamp, Quantity = the day's total)."""
+    rows = []
+    for agg in aggregates:
+        if len(agg) < 6:
+            continue
+        day, rep_id, rep_name, manager, dealer, quantity = (str(c).strip() for c in agg[:6])
+        customer = "Dealer" if dealer.upper() == "TRUE" else ""
+        rows.append([f"{day} 00:00:00 ET", rep_id, rep_name, manager, customer, "", "", "", quantity])
+    return rows
+
+async def get_archived_sale_rows():
+    if _ARCHIVE_TOTALS["rows"] is None:
+        generation = _ARCHIVE_TOTALS["generation"]
+        rows = archived_sale_rows(await run_sheets_call(fetch_archive_aggregates))
+        if generation != _ARCHIVE_TOTALS["generation"]:
+            return rows  # a rollover landed mid-read; don't cache what may be the old tab
+        _ARCHIVE_TOTALS["rows"] = rows
+    return _ARCHIVE_TOTALS["rows"]
+
+def forget_archive_totals():
+    """Drop the cached Aggregates rows (and any read of them already in flight)."""
+    _ARCHIVE_TOTALS["rows"] = None
+    _ARCHIVE_TOTALS["generation"] += 1
+
+def _cells(row):
+    return {"values": [{"userEnteredValue": {"stringValue": str(c)}} for c in row]}
+
+def archive_closed_periods(cutoff: date):
+    """
+    Move the leading run of Sheet1 rows stamped before cutoff into their month's archive tab
+    and their per-day totals into Aggregates, as one atomic batchUpdate (tabs created in the
+    same call). Stops at the first row that is newer or has no readable timestamp, so late
+    hand-entered rows further down simply stay in Sheet1. Returns {"rows": n, "periods": [...]}.
+    """
+    meta = sheets_scheduler.execute(get_spreadsheet_api().get(
+        spreadsheetId=GOOGLE_SHEET_ID,
+        fields="sheets.properties(sheetId,title)",
+    ))
+    sheet_ids = {s["properties"]["title"]: s["properties"].get("sheetId", 0) for s in meta.get("sheets", [])}
+
+    values = sales_sheet_tail._read(SHEET_RANGE)
+    header = values[0] if values and _is_sales_header(values[0]) else None
+    first = 2 if header else 1
+    cutoff_key = day_key(cutoff)
+
+    by_period, totals, seen_ids = {}, {}, set()
+    moved = 0
+    for row in values[first - 1:]:
+        decoded = decode_et_timestamp(str(row[0])) if row else None
+        if decoded is None or decoded[0] >= cutoff_key:
+            break
+        moved += 1
+        by_period.setdefault(_day_text(decoded[0])[:7], []).append(row)
+        rec = _mirror_record(row)
+        if rec is None or (rec[12] and rec[12] in seen_ids):
+            continue
+        seen_ids.add(rec[12])
+        k = (decoded[0], rec[5], rec[6], rec[7], rec[11])
+        totals[k] = totals.get(k, 0) + rec[13]
+
+    if not moved:
+        return {"rows": 0, "periods": []}
+
+    requests = []
+    next_id = max(sheet_ids.values(), default=0) + 1
+
+    def tab(title: str, header_row):
+        nonlocal next_id
+        if title not in sheet_ids:
+            sheet_ids[title] = next_id
+            next_id += 1
+            requests.append({"addSheet": {"properties": {"sheetId": sheet_ids[title], "title": title}}})
+            if header_row:
+                requests.append({"appendCells": {"sheetId": sheet_ids[title], "rows": [_cells(header_row)], "fields": "userEnteredValue"}})
+        return sheet_ids[title]
+
+    for period, rows in sorted(by_period.items()):
+        requests.append({"appendCells": {
+            "sheetId": tab(ARCHIVE_TAB_PREFIX + period, header),
+            "rows": [_cells(r) for r in rows],
+            "fields": "userEnteredValue",
+        }})
+    aggregates = [
+        [_day_text(day), rep_id, rep_name, manager, "TRUE" if is_dealer else "FALSE", str(n), _day_text(day)[:7]]
+        for (day, rep_id, rep_name, manager, is_dealer), n in sorted(totals.items())
+    ]
+    if aggregates:
+        requests.append({"appendCells": {
+            "sheetId": tab(AGGREGATES_TAB, AGGREGATES_HEADER),
+            "rows": [_cells(r) for r in aggregates],
+            "fields": "userEnteredValue",
+        }})
+    requests.append({"deleteDimension": {"range": {
+        "sheetId": sheet_ids[SHEET_TAB], "dimension": "ROWS",
+        "startIndex": first - 1, "endIndex": first - 1 + moved,
+    }}})
+
+    sheets_scheduler.execute(get_spreadsheet_api().batchUpdate(
+        spreadsheetId=GOOGLE_SHEET_ID, body={"requests": requests}
+    ), "write")
+    # Before anything can rebuild from the shorter Sheet1, make sure it won't pair it with the old totals.
+    forget_archive_totals()
+    # Every row number we know is stale now.
+    sales_sheet_tail.request_full_read(rebuild=True)
+    return {"rows": moved, "periods": sorted(by_period)}
+
+async def roll_over_sales_sheet(cutoff: date = None):
+    """
+    Archive closed months and rebuild the mirror from the smaller Sheet1. None if a rollover
+    is already running. Raises only if nothing was moved; a failed rebuild after the move is
+    reported in result["resync_error"] (the mirror loop retries the rebuild on its own).
+    """
+    if _ROLLOVER["running"]:
         return None
-    return info.get("manager")
+    _ROLLOVER["running"] = True
+    try:
+        cutoff = cutoff or archive_cutoff(datetime.now(ET).date())
+        result = await run_sheets_write(archive_closed_periods, cutoff)
+        result["resync_error"] = None
+        if result["rows"]:
+            try:
+                await resync_sales()
+            except Exception as e:
+                result["resync_error"] = e
+        return result
+    finally:
+        _ROLLOVER["running"] = False
+
+async def sheet_archive_loop():
+    while True:
+        await asyncio.sleep(SHEET_ARCHIVE_CHECK_SECONDS)
+        try:
+            cutoff = archive_cutoff(datetime.now(ET).date())
+            # The mirror knows whether Sheet1 still has anything that old; skip the full read if not.
+            if await run_db_call(sales_mirror.has_sheet_rows_before, day_key(cutoff)):
+                result = await roll_over_sales_sheet(cutoff)
+                if result and result["rows"]:
+                    print(f"Archived {result['rows']} Sheet1 rows ({', '.join(result['periods'])}).")
+                if result and result["resync_error"]:
+                    e = result["resync_error"]
+                    print(f"Re-sync after archive failed, will retry: {type(e).__name__}: {e}")
+        except Exception as e:
+            print(f"Sheet1 archive rollover failed: {type(e).__name__}: {e}")
+
+# ===========================
+# WRITE-BEHIND APPEND QUEUE
+# ===========================
+# Ships the sale log to Sheet1. Entries are claimed oldest-first and written with a
+# single values.append once APPEND_BATCH_MAX_ROWS are waiting or the delay expires.
+# A failed append puts its entries back to pending and retries with backoff.
+APPEND_BATCH_MAX_ROWS = int(os.getenv("APPEND_BATCH_MAX_ROWS", "50"))
+APPEND_BATCH_MAX_DELAY_MS = int(os.getenv("APPEND_BATCH_MAX_DELAY_MS", "500"))
+APPEND_RETRY_MIN_SECONDS = 2
+APPEND_RETRY_MAX_SECONDS = 120
+# Heroku sends SIGKILL 30s after SIGTERM; leave room for the warm snapshot after the flush.
+APPEND_SHUTDOWN_FLUSH_SECONDS = float(os.getenv("APPEND_SHUTDOWN_FLUSH_SECONDS", "20"))
+
+class SaleAppendQueue:
+    """
+    Write-behind shipper for the local sale log.
+    submit(rows) returns as soon as the rows are durable locally; Sheets catches up in the background.
+    """
 
-def get_rep_name_map():
-    """RepId -> RepName map from Roster only (fast + stable)."""
-    rep_map = {}
-    roster = get_roster_map_cached()
-    for rep_id, info in roster.items():
-        name = (info.get("rep_name") or "").strip()
-        if name:
-            rep_map[str(rep_id)] = name
-    return rep_map
+    def __init__(self, log: SaleLog, max_rows: int, max_delay_seconds: float):
+        self.log = log
+        self.max_rows = max(1, max_rows)
+        self.max_delay = max(0.0, max_delay_seconds)
+        self._backlog = 0         # rows logged but not yet confirmed (best effort)
+        self._wakeup = None
+        self._stopping = None
+        self._task = None
+        self._waiters = {}        # seq -> futures resolved when Sheets acknowledges it
+
+    def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="sale-append-queue")
+
+    async def submit(self, rows: list[list[str]]) -> list[int]:
+        """Durably log rows locally and schedule them for Sheets. Returns their log sequence numbers."""
+        if self._stopping is not None and self._stopping.is_set():
+            raise RuntimeError("Sale append queue is shutting down.")
+        seqs = await run_db_call(self.log.append, rows)
+        self.start()
+        self._backlog += len(seqs)
+        self._wakeup.set()
+        return seqs
+
+    async def wait_confirmed(self, seqs, timeout: float) -> bool:
+        """Wait until Sheets has acknowledged every seq. False if that takes longer than timeout."""
+        loop = asyncio.get_running_loop()
+        # Register before checking the log, so a confirmation landing in between isn't missed.
+        futures = {seq: loop.create_future() for seq in seqs}
+        for seq, fut in futures.items():
+            self._waiters.setdefault(seq, []).append(fut)
+        try:
+            self._resolve(set(seqs) - await run_db_call(self.log.unconfirmed, seqs))
+            if not futures:
+                return True
+            _, pending = await asyncio.wait(futures.values(), timeout=timeout)
+            return not pending
+        finally:
+            for seq, fut in futures.items():
+                waiting = self._waiters.get(seq, [])
+                if fut in waiting:
+                    waiting.remove(fut)
+                if not waiting:
+                    self._waiters.pop(seq, None)
+
+    def _resolve(self, seqs):
+        for seq in seqs:
+            for fut in self._waiters.pop(seq, []):
+                if not fut.done():
+                    fut.set_result(True)
+
+    async def close(self):
+        """Make one last attempt to ship the backlog, then stop. Anything left stays in the log."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def _pause(self, seconds: float):
+        """Sleep, but wake early on shutdown."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        retry_delay = APPEND_RETRY_MIN_SECONDS
+
+        # Entries left SENDING by a crash may or may not be in Sheet1 already; settle them first
+        # so replay stays in order and nothing is appended twice.
+        while not self._stopping.is_set():
+            if await self._recover():
+                break
+            await self._pause(retry_delay)
+            retry_delay = min(retry_delay * 2, APPEND_RETRY_MAX_SECONDS)
+
+        retry_delay = 0
+        while not self._stopping.is_set():
+            if retry_delay:
+                await self._pause(retry_delay)
+            elif self._backlog <= 0:
+                await self._wakeup.wait()
+            self._wakeup.clear()
+
+            # Hold the batch open until it is full, the delay expires, or we're shutting down.
+            deadline = loop.time() + self.max_delay
+            while self._backlog < self.max_rows and not self._stopping.is_set():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                self._wakeup.clear()
+
+            if await self._ship_pending():
+                retry_delay = 0
+            else:
+                retry_delay = min(max(retry_delay * 2, APPEND_RETRY_MIN_SECONDS), APPEND_RETRY_MAX_SECONDS)
+
+        await self._ship_pending()
+
+    async def _recover(self) -> bool:
+        try:
+            in_flight = await run_db_call(self.log.in_flight)
+            if not in_flight:
+                self._backlog = await run_db_call(self.log.unconfirmed_count)
+                return True
+
+            # Needs to be read now: the in-flight appends may have landed after any earlier read.
+            numbered = await run_sheets_call(fetch_numbered_sales_rows)
+            keys = [_row_key(row) for _, row in in_flight]
+            already_confirmed = await run_db_call(self.log.confirmed_counts, keys)
+
+            # Sheet rows per key; older copies belong to entries we already confirmed,
+            # so in-flight entries may only claim the newest leftovers.
+            wanted = set(keys)
+            positions = {}
+            for sheet_row, row in numbered:
+                k = _row_key(row)
+                if k in wanted:
+                    positions.setdefault(k, []).append(sheet_row)
+            for k, rows_at in positions.items():
+                positions[k] = rows_at[already_confirmed.get(k, 0):]
+
+            landed, landed_rows, resend = [], [], []
+            for seq, row in in_flight:
+                rows_at = positions.get(_row_key(row))
+                if rows_at:
+                    landed.append(seq)
+                    landed_rows.append(rows_at.pop(0))
+                else:
+                    resend.append(seq)
+
+            await run_db_call(self.log.confirm, landed, landed_rows)
+            self._resolve(landed)
+            await run_db_call(self.log.mark_pending, resend)
+            self._backlog = await run_db_call(self.log.unconfirmed_count)
+            print(f"Sale log recovery: {len(landed)} in-flight confirmed, {len(resend)} re-queued.")
+            return True
+        except Exception as e:
+            print(f"Sale log recovery failed, will retry: {type(e).__name__}: {e}")
+            return False
+
+    async def _ship_pending(self) -> bool:
+        """Ship pending entries oldest-first. Returns False if an append failed."""
+        while True:
+            batch = await run_db_call(self.log.claim_pending, self.max_rows)
+            if not batch:
+                self._backlog = 0
+                return True
+
+            seqs = [seq for seq, _ in batch]
+            try:
+                first_row = await run_sheets_write(append_sales_batch_to_sheet, [row for _, row in batch])
+            except Exception as e:
+                await run_db_call(self.log.mark_pending, seqs)
+                print(f"Sheets append failed for {len(seqs)} logged sales, will retry: {type(e).__name__}: {e}")
+                return False
+
+            sheet_rows = [first_row + i if first_row else None for i in range(len(seqs))]
+            await run_db_call(self.log.confirm, seqs, sheet_rows)
+            self._resolve(seqs)
+            self._backlog = max(0, self._backlog - len(seqs))
+
+sale_append_queue = SaleAppendQueue(sale_log, APPEND_BATCH_MAX_ROWS, APPEND_BATCH_MAX_DELAY_MS / 1000)
 
 # ===========================
 # BULK LOGGING (Dealer channels)
 # ===========================
-MAX_BULK_LOG = 200  # safety cap
+MAX_BULK_LOG = 5000  # safety cap; a bulk log is one row however large it is
 
 class BulkCountModal(discord.ui.Modal, title="Bulk Log (count)"):
     count = discord.ui.TextInput(
@@ -395,6 +2290,7 @@ class BulkISPView(discord.ui.View):
     def __init__(self, count: int):
         super().__init__(timeout=120)
         self.count = count
+        self.submission_id = new_submission_id()
 
     async def _submit(self, interaction: discord.Interaction, isp: str):
         if not await require_allowed_channel(interaction):
@@ -410,19 +2306,20 @@ class BulkISPView(discord.ui.View):
         group_name = get_dealer_group_name(interaction)
         ts = datetime.now(ET).strftime("%Y-%m-%d %H:%M:%S ET")
 
-        rows = []
-        for _ in range(self.count):
-            # Timestamp | RepId | RepName | Manager | Customer | ISP | Plan
-            rows.append([ts, str(rep_id), rep_name, group_name, "Dealer", isp, ""])
+        # Timestamp | RepId | RepName | Manager | Customer | ISP | Plan | SubmissionId | Quantity
+        rows = [[ts, str(rep_id), rep_name, group_name, "Dealer", isp, "", self.submission_id, str(self.count)]]
 
         try:
-            append_sales_batch_to_sheet(rows)
+            seqs = await append_sales_batch_to_sheet_async(rows)
         except Exception as e:
             await interaction.followup.send(
-                f"⚠️ Could not log to Google Sheets.\n`{type(e).__name__}: {e}`",
+                f"⚠️ Could not save this bulk log.\n`{type(e).__name__}: {e}`",
                 ephemeral=True
             )
             return
+        if not seqs:
+            await interaction.followup.send("This bulk log is already saved.", ephemeral=True)
+            return
 
         # Public confirmation in the channel (NOT ephemeral)
         await interaction.followup.send(
@@ -477,6 +2374,7 @@ class CustomerModal(discord.ui.Modal, title="Enter Customer Name"):
     def __init__(self, user_id: int):
         super().__init__()
         self.user_id = user_id
+        self.submission_id = new_submission_id()
 
     async def on_submit(self, interaction: discord.Interaction):
         if not await require_allowed_channel(interaction):
@@ -490,15 +2388,16 @@ class CustomerModal(discord.ui.Modal, title="Enter Customer Name"):
 
         await interaction.response.send_message(
             embed=embed,
-            view=ISPButtons(self.customer_name.value, self.user_id),
+            view=ISPButtons(self.customer_name.value, self.user_id, self.submission_id),
             ephemeral=True
         )
 
 class ISPButtons(discord.ui.View):
-    def __init__(self, customer_name: str, user_id: int):
+    def __init__(self, customer_name: str, user_id: int, submission_id: str):
         super().__init__(timeout=120)
         self.customer_name = customer_name
         self.user_id = user_id
+        self.submission_id = submission_id
 
     async def pick(self, interaction: discord.Interaction, isp: str):
         if not await require_allowed_channel(interaction):
@@ -511,7 +2410,7 @@ class ISPButtons(discord.ui.View):
         )
         await interaction.response.send_message(
             embed=embed,
-            view=PlanDropdown(self.customer_name, isp, self.user_id),
+            view=PlanDropdown(self.customer_name, isp, self.user_id, self.submission_id),
             ephemeral=True
         )
 
@@ -544,15 +2443,56 @@ class ISPButtons(discord.ui.View):
         await self.pick(i, "Bluepeak")
 
 class PlanDropdown(discord.ui.View):
-    def __init__(self, customer: str, isp: str, user_id: int):
+    def __init__(self, customer: str, isp: str, user_id: int, submission_id: str):
         super().__init__(timeout=120)
-        self.add_item(PlanSelect(customer, isp, user_id))
+        self.add_item(PlanSelect(customer, isp, user_id, submission_id))
+
+# Sale messages are edited in place once Sheet1 has the row. The interaction token
+# allows edits for 15 minutes; past SALE_CONFIRM_WAIT_SECONDS the "syncing" footer stays.
+SALE_CONFIRM_WAIT_SECONDS = int(os.getenv("SALE_CONFIRM_WAIT_SECONDS", "300"))
+
+_SALE_FOLLOWUPS = set()
+
+def sale_embed(rep_name: str, customer: str, isp: str, plan: str, daily, footer: str):
+    """The sale card; daily=None while the sale is still being logged."""
+    if daily is None:
+        embed = discord.Embed(title="⏳ Logging sale…", color=discord.Color.light_grey())
+    else:
+        embed = discord.Embed(title="✅ Sale Logged!", color=discord.Color.gold())
+    embed.add_field(name="Rep", value=rep_name, inline=False)
+    embed.add_field(name="Customer", value=customer, inline=False)
+    embed.add_field(name="ISP", value=isp, inline=True)
+    embed.add_field(name="Plan", value=plan, inline=True)
+    embed.add_field(name="Today's Sales", value="…" if daily is None else str(daily), inline=False)
+    embed.set_footer(text=footer)
+    return embed
+
+def start_sale_followup(coro):
+    """Run a message follow-up in the background (held here so it isn't garbage-collected mid-edit)."""
+    task = asyncio.create_task(coro)
+    _SALE_FOLLOWUPS.add(task)
+    task.add_done_callback(_SALE_FOLLOWUPS.discard)
+
+async def confirm_sale_message(interaction: discord.Interaction, seqs, rep_id: int, rep_name: str, customer: str, isp: str, plan: str):
+    try:
+        if not await sale_append_queue.wait_confirmed(seqs, SALE_CONFIRM_WAIT_SECONDS):
+            return
+        try:
+            daily = (await get_rep_counts(rep_id))["daily"]
+        except Exception:
+            daily = "—"  # the sale is in Sheet1 either way; say so
+        await interaction.edit_original_response(
+            embed=sale_embed(rep_name, customer, isp, plan, daily, "Saved to Google Sheets")
+        )
+    except Exception as e:
+        print(f"Sale confirmation edit failed: {type(e).__name__}: {e}")
 
 class PlanSelect(discord.ui.Select):
-    def __init__(self, customer: str, isp: str, user_id: int):
+    def __init__(self, customer: str, isp: str, user_id: int, submission_id: str):
         self.customer = customer
         self.isp = isp
         self.user_id = user_id
+        self.submission_id = submission_id
 
         options = [
             discord.SelectOption(label="500mbps"),
@@ -574,49 +2514,181 @@ class PlanSelect(discord.ui.Select):
         rep_id = interaction.user.id
         rep_name = interaction.user.display_name
 
-        manager = lookup_manager_for_rep(rep_id)
-        if not manager:
+        not_rostered = (
+            "⚠️ You’re not assigned to a manager yet (or you’re inactive). "
+            "An admin needs to add you to the **Roster** sheet."
+        )
+
+        async def fail(message: str):
+            # Problems stay private, like before: drop the public placeholder and tell only the rep.
+            await interaction.delete_original_response()
+            await interaction.followup.send(message, ephemeral=True)
+
+        # Acknowledge first: the 3-second window closes whatever the roster or the log are doing.
+        if sale_manager_ready():
+            # Roster in memory: check it before anything goes public.
+            manager = await manager_for_sale(rep_id)
+            if not manager:
+                await interaction.response.send_message(not_rostered, ephemeral=True)
+                return
             await interaction.response.send_message(
-                "⚠️ You’re not assigned to a manager yet (or you’re inactive). "
-                "An admin needs to add you to the **Roster** sheet.",
-                ephemeral=True
+                embed=sale_embed(rep_name, self.customer, self.isp, plan, None, "Logging…"),
+                ephemeral=False
             )
-            return
+        else:
+            # Cold roster: a "thinking…" placeholder until it loads (only on the first sale after a cold start).
+            await interaction.response.defer(thinking=True)
+            try:
+                manager = await manager_for_sale(rep_id)
+            except Exception as e:
+                await fail(f"⚠️ Could not check the Roster. Try again.\n`{type(e).__name__}: {e}`")
+                return
+            if not manager:
+                await fail(not_rostered)
+                return
 
         try:
-            append_sale_to_sheet(rep_id, rep_name, manager, self.customer, self.isp, plan)
+            seqs = await append_sale_to_sheet_async(rep_id, rep_name, manager, self.customer, self.isp, plan, self.submission_id)
         except Exception as e:
-            await interaction.response.send_message(
-                f"⚠️ Could not log to Google Sheets. Try again.\n`{type(e).__name__}: {e}`",
-                ephemeral=True
-            )
+            await fail(f"⚠️ Could not save this sale. Try again.\n`{type(e).__name__}: {e}`")
+            return
+        if not seqs:
+            await fail("This sale is already logged.")
             return
 
-        counts = get_rep_counts(rep_id)
-
-        embed = discord.Embed(title="✅ Sale Logged!", color=discord.Color.gold())
-        embed.add_field(name="Rep", value=rep_name, inline=False)
-        embed.add_field(name="Customer", value=self.customer, inline=False)
-        embed.add_field(name="ISP", value=self.isp, inline=True)
-        embed.add_field(name="Plan", value=plan, inline=True)
-        embed.add_field(name="Today's Sales", value=str(counts["daily"]), inline=False)
-        embed.set_footer(text="Logged to Google Sheets")
+        # The sale is saved from here on: nothing below may leave the card stuck on "Logging…".
+        try:
+            daily = (await get_rep_counts(rep_id))["daily"]
+        except Exception as e:
+            print(f"Rep count after sale failed: {type(e).__name__}: {e}")
+            daily = "—"
+        try:
+            await interaction.edit_original_response(
+                embed=sale_embed(rep_name, self.customer, self.isp, plan, daily, "Saved — syncing to Google Sheets")
+            )
+        except Exception as e:
+            print(f"Sale card edit failed: {type(e).__name__}: {e}")
 
-        await interaction.response.send_message(embed=embed, ephemeral=False)
+        start_sale_followup(confirm_sale_message(interaction, seqs, rep_id, rep_name, self.customer, self.isp, plan))
 
 # ===========================
 # DISCORD UI: LEADERBOARD MODE SELECT
 # ===========================
-class LeaderboardModeSelect(discord.ui.Select):
-    def __init__(self):
-        options = [
-            discord.SelectOption(label="Daily", value="daily", description="Today only"),
-            discord.SelectOption(label="Monthly", value="monthly", description="This month"),
-            discord.SelectOption(label="YTD", value="ytd", description="Year-to-date"),
+def _timeframe_options():
+    return [
+        discord.SelectOption(label=label, value=value, description=description)
+        for value, (label, description) in TIMEFRAMES.items()
+    ]
+
+def _timeframe_title(mode: str, as_of: date = None):
+    """'Monthly' today, 'Monthly · 2026-03-01 → 2026-03-15' for other dates and past periods."""
+    label = TIMEFRAMES[mode][0]
+    if as_of is None and mode in COUNT_MODES:
+        return label
+    first, last = timeframe_range(mode, as_of or datetime.now(ET).date())
+    return f"{label} · {_date_span(first, last)}"
+
+def _date_span(first: date, last: date):
+    return first.isoformat() if first == last else f"{first.isoformat()} → {last.isoformat()}"
+
+def parse_date_option(value: str):
+    """'YYYY-MM-DD' slash command option -> date, or None if it doesn't parse."""
+    try:
+        return datetime.strptime(value.strip(), "%Y-%m-%d").date()
+    except Exception:
+        return None
+
+# Sorted rankings and their rendered embeds (Embed.to_dict() payloads), keyed by board,
+# title and the mirror version the counts were taken at. Nothing is invalidated by hand:
+# the next sale bumps the version, so older entries stop matching and age out of the LRU.
+BOARD_RENDER_CACHE_SIZE = int(os.getenv("BOARD_RENDER_CACHE_SIZE", "64"))
+_BOARD_RENDERS = OrderedDict()  # key -> {"ranking": [(label, total)], "embed": payload or None}
+
+def _cached_render(key):
+    render = _BOARD_RENDERS.get(key)
+    if render is not None:
+        _BOARD_RENDERS.move_to_end(key)
+    return render
+
+def _store_render(key, render):
+    _BOARD_RENDERS[key] = render
+    _BOARD_RENDERS.move_to_end(key)
+    while len(_BOARD_RENDERS) > BOARD_RENDER_CACHE_SIZE:
+        _BOARD_RENDERS.popitem(last=False)
+    return render
+
+def _render_key(board: str, title: str, version):
+    """None (don't cache) without a version. Today's date is part of it: midnight resets the live buckets."""
+    if version is None:
+        return None
+    return (board, title, version, _ROSTER_CACHE["version"], datetime.now(ET).date())
+
+def _ranking_embed(title: str, ranking, footer: str):
+    embed = discord.Embed(title=title, color=discord.Color.gold())
+    medals = ["🥇", "🥈", "🥉"]
+    for idx, (label, total) in enumerate(ranking, start=1):
+        rank_icon = medals[idx - 1] if idx <= 3 else f"#{idx}"
+        embed.add_field(name=f"{rank_icon} {label}", value=f"**{total}** sales", inline=False)
+    embed.set_footer(text=footer)
+    return embed.to_dict()
+
+async def rep_leaderboard_render(title: str, counts: dict, version=None):
+    """Top 25 reps as {"ranking", "embed"}; embed is None when there are no sales. Cached per version."""
+    key = _render_key("rep", title, version)
+    render = _cached_render(key) if key else None
+    if render is not None:
+        return render
+    ranking = []
+    if counts:
+        rep_name_map = await get_rep_name_map()
+        sorted_reps = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+        ranking = [
+            (rep_name_map.get(str(rep_id_str), f"Unknown ({rep_id_str})"), total)
+            for rep_id_str, total in sorted_reps[:25]
         ]
+    render = {
+        "ranking": ranking,
+        "embed": _ranking_embed(
+            f"🏆 {title} Leaderboard", ranking, "Counts pulled from Google Sheets (Dealer rows excluded)"
+        ) if ranking else None,
+    }
+    return _store_render(key, render) if key else render
+
+async def manager_leaderboard_render(title: str, counts: dict, version=None):
+    """Top 25 managers as {"ranking", "embed"}; embed is None when there are no sales. Cached per version."""
+    key = _render_key("manager", title, version)
+    render = _cached_render(key) if key else None
+    if render is not None:
+        return render
+    ranking = sorted(counts.items(), key=lambda x: x[1], reverse=True)[:25] if counts else []
+    render = {
+        "ranking": ranking,
+        "embed": _ranking_embed(
+            f"🏆 Manager Leaderboard ({title})", ranking, "Counts pulled from Google Sheets"
+        ) if ranking else None,
+    }
+    return _store_render(key, render) if key else render
+
+async def send_rep_leaderboard(interaction: discord.Interaction, title: str, counts: dict, version=None):
+    render = await rep_leaderboard_render(title, counts, version)
+    if render["embed"] is None:
+        await interaction.followup.send("No sales found for that timeframe.", ephemeral=True)
+        return
+    await interaction.followup.send(embed=discord.Embed.from_dict(render["embed"]))
+
+async def send_manager_leaderboard(interaction: discord.Interaction, title: str, counts: dict, version=None):
+    render = await manager_leaderboard_render(title, counts, version)
+    if render["embed"] is None:
+        await interaction.followup.send("No sales found for that timeframe.")
+        return
+    await interaction.followup.send(embed=discord.Embed.from_dict(render["embed"]))
+
+class LeaderboardModeSelect(discord.ui.Select):
+    def __init__(self, as_of: date = None):
+        self.as_of = as_of
         super().__init__(
             placeholder="Choose leaderboard timeframe…",
-            options=options,
+            options=_timeframe_options(),
             min_values=1,
             max_values=1
         )
@@ -628,51 +2700,24 @@ class LeaderboardModeSelect(discord.ui.Select):
         mode = self.values[0]
         await interaction.response.defer()  # not ephemeral so it posts normally
 
-        rows = fetch_sales_rows()
         # ✅ exclude dealer bulk rows from rep leaderboard
-        counts = compute_counts(rows, mode=mode, key="rep", exclude_dealer_rows=True)
-
-        if not counts:
-            await interaction.followup.send("No sales found for that timeframe.", ephemeral=True)
-            return
-
-        rep_name_map = get_rep_name_map()
-        sorted_reps = sorted(counts.items(), key=lambda x: x[1], reverse=True)
-
-        title_map = {
-            "daily": "🏆 Daily Leaderboard",
-            "monthly": "🏆 Monthly Leaderboard",
-            "ytd": "🏆 YTD Leaderboard",
-        }
-        embed = discord.Embed(title=title_map.get(mode, "🏆 Leaderboard"), color=discord.Color.gold())
-
-        medals = ["🥇", "🥈", "🥉"]
-        for idx, (rep_id_str, total) in enumerate(sorted_reps[:25], start=1):
-            rank_icon = medals[idx - 1] if idx <= 3 else f"#{idx}"
-            display_name = rep_name_map.get(str(rep_id_str), f"Unknown ({rep_id_str})")
-            embed.add_field(name=f"{rank_icon} {display_name}", value=f"**{total}** sales", inline=False)
-
-        embed.set_footer(text="Counts pulled from Google Sheets (Dealer rows excluded)")
-        await interaction.followup.send(embed=embed)
+        version, counts = await board_timeframe_counts(mode, key="rep", exclude_dealer_rows=True, as_of=self.as_of)
+        await send_rep_leaderboard(interaction, _timeframe_title(mode, self.as_of), counts, version)
 
 class LeaderboardView(discord.ui.View):
-    def __init__(self):
+    def __init__(self, as_of: date = None):
         super().__init__(timeout=60)
-        self.add_item(LeaderboardModeSelect())
+        self.add_item(LeaderboardModeSelect(as_of))
 
 # ===========================
 # DISCORD UI: MANAGER LEADERBOARD
 # ===========================
 class ManagerboardModeSelect(discord.ui.Select):
-    def __init__(self):
-        options = [
-            discord.SelectOption(label="Daily", value="daily", description="Today only"),
-            discord.SelectOption(label="Monthly", value="monthly", description="This month"),
-            discord.SelectOption(label="YTD", value="ytd", description="Year-to-date"),
-        ]
+    def __init__(self, as_of: date = None):
+        self.as_of = as_of
         super().__init__(
             placeholder="Choose manager leaderboard timeframe…",
-            options=options,
+            options=_timeframe_options(),
             min_values=1,
             max_values=1
         )
@@ -684,41 +2729,209 @@ class ManagerboardModeSelect(discord.ui.Select):
         mode = self.values[0]
         await interaction.response.defer()
 
-        rows = fetch_sales_rows()
         # ✅ managerboard includes everything (including Dealer rows)
-        counts = compute_counts(rows, mode=mode, key="manager")
-
-        if not counts:
-            await interaction.followup.send("No sales found for that timeframe.")
-            return
+        version, counts = await board_timeframe_counts(mode, key="manager", exclude_dealer_rows=False, as_of=self.as_of)
+        await send_manager_leaderboard(interaction, _timeframe_title(mode, self.as_of), counts, version)
 
-        sorted_mgrs = sorted(counts.items(), key=lambda x: x[1], reverse=True)
-
-        title_map = {
-            "daily": "🏆 Manager Leaderboard (Daily)",
-            "monthly": "🏆 Manager Leaderboard (Monthly)",
-            "ytd": "🏆 Manager Leaderboard (YTD)",
-        }
-        embed = discord.Embed(title=title_map.get(mode, "🏆 Manager Leaderboard"), color=discord.Color.gold())
+class ManagerboardView(discord.ui.View):
+    def __init__(self, as_of: date = None):
+        super().__init__(timeout=60)
+        self.add_item(ManagerboardModeSelect(as_of))
 
-        medals = ["🥇", "🥈", "🥉"]
-        for idx, (mgr, total) in enumerate(sorted_mgrs[:25], start=1):
-            rank_icon = medals[idx - 1] if idx <= 3 else f"#{idx}"
-            embed.add_field(name=f"{rank_icon} {mgr}", value=f"**{total}** sales", inline=False)
+# ===========================
+# LIVE LEADERBOARDS
+# ===========================
+# /liveboard posts a leaderboard message that edits itself as sales come in, so a contest
+# channel doesn't need everyone running /leaderboard. Every LIVE_BOARD_DEBOUNCE_SECONDS the
+# loop checks the mirror version; when it moved, each (board, timeframe) is counted and
+# rendered once (through the precompute pass and render cache) and only messages whose
+# top 25 actually changed are edited. Edits in one channel are spaced out, and a rate-limited
+# or failed edit is retried later. Deleting the message stops it.
+LIVE_BOARD_DEBOUNCE_SECONDS = int(os.getenv("LIVE_BOARD_DEBOUNCE_SECONDS", "15"))
+LIVE_BOARD_EDIT_SPACING_SECONDS = float(os.getenv("LIVE_BOARD_EDIT_SPACING_SECONDS", "1.5"))  # per channel
+LIVE_BOARD_RETRY_SECONDS = 60
+LIVE_BOARD_TYPES = {"rep": ("rep", True), "manager": ("manager", False)}  # board -> (key, exclude_dealer_rows)
+
+_LIVE_BOARDS = {}  # message_id -> {"channel_id", "board", "mode", "ranking", "retry_at"}
+
+def load_live_boards():
+    return sales_db().execute("SELECT message_id, channel_id, board, mode FROM live_boards").fetchall()
+
+def save_live_board(message_id: int, channel_id: int, board: str, mode: str):
+    db = sales_db()
+    with db:
+        db.execute(
+            "INSERT OR REPLACE INTO live_boards (message_id, channel_id, board, mode) VALUES (?, ?, ?, ?)",
+            (message_id, channel_id, board, mode),
+        )
 
-        embed.set_footer(text="Counts pulled from Google Sheets")
-        await interaction.followup.send(embed=embed)
+def delete_live_board(message_id: int):
+    db = sales_db()
+    with db:
+        db.execute("DELETE FROM live_boards WHERE message_id = ?", (message_id,))
+
+def _track_live_board(message_id: int, channel_id: int, board: str, mode: str, ranking=None):
+    _LIVE_BOARDS[message_id] = {
+        "channel_id": channel_id, "board": board, "mode": mode, "ranking": ranking, "retry_at": 0.0,
+    }
+
+async def restore_live_boards():
+    for message_id, channel_id, board, mode in await run_db_call(load_live_boards):
+        if board in LIVE_BOARD_TYPES and mode in TIMEFRAMES:
+            _track_live_board(message_id, channel_id, board, mode)  # no ranking yet: refreshed on the first pass
+
+async def live_board_render(board: str, mode: str):
+    key, excl = LIVE_BOARD_TYPES[board]
+    version, counts = await board_timeframe_counts(mode, key=key, exclude_dealer_rows=excl)
+    title = _timeframe_title(mode)
+    if board == "rep":
+        return await rep_leaderboard_render(title, counts, version)
+    return await manager_leaderboard_render(title, counts, version)
+
+def live_board_embed(board: str, mode: str, render):
+    footer = "Live"
+    if render["embed"] is not None:
+        embed = discord.Embed.from_dict(render["embed"])
+        footer = f"{render['embed'].get('footer', {}).get('text', '')} · Live".lstrip(" ·")
+    else:
+        title = _timeframe_title(mode)
+        embed = discord.Embed(
+            title=f"🏆 {title} Leaderboard" if board == "rep" else f"🏆 Manager Leaderboard ({title})",
+            description="No sales yet for this timeframe.",
+            color=discord.Color.gold()
+        )
+    updated = datetime.now(ET).strftime("%H:%M ET")
+    embed.set_footer(text=f"{footer} · updated {updated}")
+    return embed
+
+async def _forget_live_board(message_id: int):
+    _LIVE_BOARDS.pop(message_id, None)
+    await run_db_call(delete_live_board, message_id)
+
+async def refresh_live_boards(client: discord.Client) -> bool:
+    """Edit every live board whose top 25 changed. Returns True if an edit is waiting on a retry."""
+    renders = {}
+    last_edit = {}  # channel_id -> loop time of our last edit there
+    waiting = False
+    loop = asyncio.get_running_loop()
+    for message_id, live in list(_LIVE_BOARDS.items()):
+        board_key = (live["board"], live["mode"])
+        if board_key not in renders:
+            renders[board_key] = await live_board_render(*board_key)
+        render = renders[board_key]
+        if render["ranking"] == live["ranking"]:
+            continue
+        if live["retry_at"] > loop.time():
+            waiting = True
+            continue
 
-class ManagerboardView(discord.ui.View):
-    def __init__(self):
-        super().__init__(timeout=60)
-        self.add_item(ManagerboardModeSelect())
+        gap = last_edit.get(live["channel_id"], -LIVE_BOARD_EDIT_SPACING_SECONDS) + LIVE_BOARD_EDIT_SPACING_SECONDS - loop.time()
+        if gap > 0:
+            await asyncio.sleep(gap)
+        try:
+            channel = client.get_channel(live["channel_id"]) or await client.fetch_channel(live["channel_id"])
+            await channel.get_partial_message(message_id).edit(embed=live_board_embed(*board_key, render))
+            live["ranking"] = render["ranking"]
+        except (discord.NotFound, discord.Forbidden):
+            await _forget_live_board(message_id)  # deleted, or we lost access to the channel
+        except discord.HTTPException as e:
+            retry_after = getattr(e, "retry_after", None) or LIVE_BOARD_RETRY_SECONDS
+            live["retry_at"] = loop.time() + retry_after
+            waiting = True
+            print(f"Live leaderboard edit failed, retrying in {retry_after:.0f}s: {type(e).__name__}: {e}")
+        last_edit[live["channel_id"]] = loop.time()
+    return waiting
+
+async def live_board_loop(client: discord.Client):
+    seen = None
+    waiting = False
+    while True:
+        await asyncio.sleep(LIVE_BOARD_DEBOUNCE_SECONDS)
+        if not _LIVE_BOARDS:
+            continue
+        # Everything a board's content depends on; unchanged means no work at all.
+        stamp = (sales_mirror.version, _ROSTER_CACHE["version"], datetime.now(ET).date(), len(_LIVE_BOARDS))
+        if stamp == seen and not waiting:
+            continue
+        try:
+            waiting = await refresh_live_boards(client)
+            seen = stamp
+        except Exception as e:
+            print(f"Live leaderboard refresh failed: {type(e).__name__}: {e}")
 
 # ===========================
 # BOT SETUP
 # ===========================
+class SalesBot(commands.Bot):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.background_tasks = []
+        self._close_task = None
+
+    async def setup_hook(self):
+        self._install_sigterm_handler()
+        await load_warm_snapshot()  # before the gateway connects, so the first commands hit warm caches
+        sale_append_queue.start()
+        self.background_tasks.append(
+            asyncio.create_task(sales_mirror_reconcile_loop(), name="sales-mirror-reconcile")
+        )
+        self.background_tasks.append(
+            asyncio.create_task(roster_refresh_loop(), name="roster-refresh")
+        )
+        self.background_tasks.append(
+            asyncio.create_task(warm_snapshot_loop(), name="warm-snapshot")
+        )
+        await restore_live_boards()
+        self.background_tasks.append(
+            asyncio.create_task(live_board_loop(self), name="live-leaderboards")
+        )
+        if SHEET_ARCHIVE_AUTO:
+            self.background_tasks.append(
+                asyncio.create_task(sheet_archive_loop(), name="sheet-archive")
+            )
+
+    def _install_sigterm_handler(self):
+        """
+        Heroku restarts dynos with SIGTERM, which would otherwise kill the process without
+        running close(): no backlog flush, no warm snapshot. Route it through close() instead.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(self.close()))
+        except (NotImplementedError, RuntimeError):  # e.g. Windows event loops
+            signal.signal(
+                signal.SIGTERM,
+                lambda *_: loop.call_soon_threadsafe(lambda: asyncio.create_task(self.close())),
+            )
+
+    async def close(self):
+        """Runs once; SIGTERM and bot.run()'s own teardown may both call it."""
+        if self._close_task is None:
+            self._close_task = asyncio.create_task(self._shutdown())
+        await asyncio.shield(self._close_task)
+
+    async def _shutdown(self):
+        for task in self.background_tasks:
+            task.cancel()
+        # Graceful shutdown: try to land the sale log backlog; whatever is left ships on next start.
+        try:
+            await asyncio.wait_for(sale_append_queue.close(), APPEND_SHUTDOWN_FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            print("Sale append queue flush timed out on shutdown; the backlog ships on next start.")
+        except Exception as e:
+            print(f"Sale append queue flush failed on shutdown: {type(e).__name__}: {e}")
+        try:
+            await save_warm_snapshot()
+        except Exception as e:
+            print(f"Warm-start snapshot failed on shutdown: {type(e).__name__}: {e}")
+        await super().close()
+        await run_db_call(close_sales_db)
+        _DB_EXECUTOR.shutdown(wait=True)
+        _SHEETS_EXECUTOR.shutdown(wait=False)
+        _SHEETS_WRITE_EXECUTOR.shutdown(wait=False)
+
 intents = discord.Intents.default()
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = SalesBot(command_prefix="!", intents=intents)
 
 @bot.event
 async def on_ready():
@@ -747,14 +2960,20 @@ async def totals(interaction: discord.Interaction):
 
     await interaction.response.defer()
 
-    totals_data = get_total_counts()
-    now = datetime.now(ET)
+    # Version first: a sale landing mid-read leaves newer counts under the older key, which just misses next time.
+    key = _render_key("totals", "", sales_mirror.version)
+    render = _cached_render(key)
+    if render is None:
+        totals_data = await get_total_counts()
+        embed = discord.Embed(title="📈 Total Sales", color=discord.Color.green())
+        embed.add_field(name="Daily", value=str(totals_data["daily"]), inline=True)
+        embed.add_field(name="Monthly", value=str(totals_data["monthly"]), inline=True)
+        embed.add_field(name="YTD", value=str(totals_data["ytd"]), inline=True)
+        embed.add_field(name="All-time", value=str(totals_data["all"]), inline=True)
+        render = _store_render(key, {"ranking": None, "embed": embed.to_dict()})
 
-    embed = discord.Embed(title="📈 Total Sales", color=discord.Color.green())
-    embed.add_field(name="Daily", value=str(totals_data["daily"]), inline=True)
-    embed.add_field(name="Monthly", value=str(totals_data["monthly"]), inline=True)
-    embed.add_field(name="YTD", value=str(totals_data["ytd"]), inline=True)
-    embed.add_field(name="All-time", value=str(totals_data["all"]), inline=True)
+    now = datetime.now(ET)
+    embed = discord.Embed.from_dict(render["embed"])
     embed.set_footer(text=f"As of {now.strftime('%Y-%m-%d %H:%M:%S ET')}")
 
     await interaction.followup.send(embed=embed)
@@ -764,30 +2983,86 @@ async def sale(interaction: discord.Interaction):
     if not await require_allowed_channel(interaction):
         return
     await interaction.response.send_modal(CustomerModal(interaction.user.id))
+    prefetch_sale_context(interaction.user.id)
+
+async def _board_dates(interaction: discord.Interaction, start: str, end: str, as_of: str):
+    """
+    Validate the optional date options shared by /leaderboard and /managerboard.
+    Returns (first, last, as_of) with first/last None unless a custom range was asked for,
+    or None after telling the user what was wrong.
+    """
+    parsed = {}
+    for name, value in (("start", start), ("end", end), ("as_of", as_of)):
+        if value:
+            parsed[name] = parse_date_option(value)
+            if parsed[name] is None:
+                await interaction.response.send_message(f"`{name}` must be a date like 2026-03-31.", ephemeral=True)
+                return None
+    first = parsed.get("start")
+    last = parsed.get("end") or (datetime.now(ET).date() if first else None)
+    if last and not first:
+        await interaction.response.send_message("Give a `start` date with `end`.", ephemeral=True)
+        return None
+    if first and first > last:
+        await interaction.response.send_message("`start` must be on or before `end`.", ephemeral=True)
+        return None
+    return first, last, parsed.get("as_of")
+
+_BOARD_DATE_OPTIONS = dict(
+    start="Custom range: first day (YYYY-MM-DD)",
+    end="Custom range: last day (YYYY-MM-DD), defaults to today",
+    as_of="Show the timeframes as they stood on this date (YYYY-MM-DD)",
+)
 
-@bot.tree.command(name="leaderboard", description="Show rep leaderboard: Daily, Monthly, or YTD (#sales or #managers)")
-async def leaderboard(interaction: discord.Interaction):
+@bot.tree.command(name="leaderboard", description="Show rep leaderboard: Daily, Monthly, YTD or a date range (#sales or #managers)")
+@discord.app_commands.describe(**_BOARD_DATE_OPTIONS)
+async def leaderboard(interaction: discord.Interaction, start: str = None, end: str = None, as_of: str = None):
     if not await require_allowed_channel(interaction):
         return
 
+    dates = await _board_dates(interaction, start, end, as_of)
+    if dates is None:
+        return
+    first, last, as_of_date = dates
+
+    if first:
+        await interaction.response.defer()
+        counts = await compute_range_counts(first, last, key="rep", exclude_dealer_rows=True)
+        await send_rep_leaderboard(interaction, _date_span(first, last), counts)
+        return
+
     embed = discord.Embed(
         title="Leaderboard",
-        description="Pick a timeframe:",
+        description="Pick a timeframe:" if as_of_date is None else f"Pick a timeframe (as of {as_of_date.isoformat()}):",
         color=discord.Color.blurple()
     )
-    await interaction.response.send_message(embed=embed, view=LeaderboardView(), ephemeral=True)
+    await interaction.response.send_message(embed=embed, view=LeaderboardView(as_of_date), ephemeral=True)
+    start_board_precompute(as_of_date)
 
-@bot.tree.command(name="managerboard", description="Show manager leaderboard: Daily, Monthly, or YTD (#sales or #managers)")
-async def managerboard(interaction: discord.Interaction):
+@bot.tree.command(name="managerboard", description="Show manager leaderboard: Daily, Monthly, YTD or a date range (#sales or #managers)")
+@discord.app_commands.describe(**_BOARD_DATE_OPTIONS)
+async def managerboard(interaction: discord.Interaction, start: str = None, end: str = None, as_of: str = None):
     if not await require_allowed_channel(interaction):
         return
 
+    dates = await _board_dates(interaction, start, end, as_of)
+    if dates is None:
+        return
+    first, last, as_of_date = dates
+
+    if first:
+        await interaction.response.defer()
+        counts = await compute_range_counts(first, last, key="manager")
+        await send_manager_leaderboard(interaction, _date_span(first, last), counts)
+        return
+
     embed = discord.Embed(
         title="Manager Leaderboard",
-        description="Pick a timeframe:",
+        description="Pick a timeframe:" if as_of_date is None else f"Pick a timeframe (as of {as_of_date.isoformat()}):",
         color=discord.Color.blurple()
     )
-    await interaction.response.send_message(embed=embed, view=ManagerboardView(), ephemeral=True)
+    await interaction.response.send_message(embed=embed, view=ManagerboardView(as_of_date), ephemeral=True)
+    start_board_precompute(as_of_date)
 
 @bot.tree.command(name="mysales", description="View your sales: Daily, Monthly, YTD (#sales or #managers)")
 async def mysales(interaction: discord.Interaction):
@@ -797,7 +3072,7 @@ async def mysales(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
 
     rep_id = interaction.user.id
-    counts = get_rep_counts(rep_id)
+    counts = await get_rep_counts(rep_id)
 
     embed = discord.Embed(title="📊 Your Sales", color=discord.Color.blue())
     embed.add_field(name="Daily", value=str(counts["daily"]), inline=True)
@@ -822,12 +3097,110 @@ async def reset(interaction: discord.Interaction):
         await interaction.response.send_message("Admin only.", ephemeral=True)
         return
 
+    await interaction.response.defer(ephemeral=True)
+
+    # Re-read Sheet1 in full and rebuild counts from it (picks up hand edits to the sheet).
+    try:
+        await resync_sales()
+    except Exception as e:
+        await interaction.followup.send(
+            f"⚠️ Could not re-read Google Sheets.\n`{type(e).__name__}: {e}`",
+            ephemeral=True
+        )
+        return
+
     embed = discord.Embed(
         title="🧹 Reset complete",
-        description="Bot state reset. Google Sheet data was NOT changed.",
+        description="Bot state reset and counts reloaded from Google Sheets. Google Sheet data was NOT changed.",
         color=discord.Color.red()
     )
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
+@bot.tree.command(name="liveboard", description="Admin: post a leaderboard here that keeps itself up to date (delete it to stop)")
+@discord.app_commands.describe(board="Which leaderboard", timeframe="Timeframe it shows")
+@discord.app_commands.choices(
+    board=[
+        discord.app_commands.Choice(name="Reps", value="rep"),
+        discord.app_commands.Choice(name="Managers", value="manager"),
+    ],
+    timeframe=[discord.app_commands.Choice(name=label, value=value) for value, (label, _) in TIMEFRAMES.items()],
+)
+async def liveboard(interaction: discord.Interaction, board: str = "rep", timeframe: str = "daily"):
+    if not await require_allowed_channel(interaction):
+        return
+    if not await require_admin_permission(interaction):
+        return
+
+    await interaction.response.defer(ephemeral=True)
+
+    render = await live_board_render(board, timeframe)
+    try:
+        message = await interaction.channel.send(embed=live_board_embed(board, timeframe, render))
+    except discord.HTTPException as e:
+        await interaction.followup.send(f"⚠️ Could not post the live leaderboard.\n`{type(e).__name__}: {e}`", ephemeral=True)
+        return
+    try:
+        await message.pin()
+    except discord.HTTPException:
+        pass  # pinning needs Manage Messages; the board works without it
+
+    await run_db_call(save_live_board, message.id, interaction.channel_id, board, timeframe)
+    _track_live_board(message.id, interaction.channel_id, board, timeframe, render["ranking"])
+    await interaction.followup.send(
+        f"Live {TIMEFRAMES[timeframe][0].lower()} {'rep' if board == 'rep' else 'manager'} leaderboard posted. "
+        "Delete the message to stop it.",
+        ephemeral=True
+    )
+
+@bot.tree.command(name="archive", description="Admin: move closed months out of Sheet1 into archive tabs")
+@discord.app_commands.describe(keep_months="Full months to keep in Sheet1 besides the current one")
+async def archive(interaction: discord.Interaction, keep_months: int = SHEET_ARCHIVE_KEEP_MONTHS):
+    if not await require_allowed_channel(interaction):
+        return
+    if not await require_admin_channel(interaction):
+        return
+    if not await require_admin_permission(interaction):
+        return
+
+    await interaction.response.defer(ephemeral=True)
+
+    cutoff = archive_cutoff(datetime.now(ET).date(), keep_months)
+    try:
+        result = await roll_over_sales_sheet(cutoff)
+    except Exception as e:
+        await interaction.followup.send(
+            f"⚠️ Archive failed; Sheet1 was not changed.\n`{type(e).__name__}: {e}`",
+            ephemeral=True
+        )
+        return
+    if result is None:
+        await interaction.followup.send("An archive is already running.", ephemeral=True)
+        return
+    if not result["rows"]:
+        await interaction.followup.send(f"Nothing in Sheet1 before {cutoff.isoformat()} to archive.", ephemeral=True)
+        return
+
+    moved = (
+        f"Moved **{result['rows']}** rows from before {cutoff.isoformat()} "
+        f"into {', '.join(ARCHIVE_TAB_PREFIX + p for p in result['periods'])}."
+    )
+    if result["resync_error"]:
+        e = result["resync_error"]
+        embed = discord.Embed(
+            title="⚠️ Archived, but re-sync failed",
+            description=(
+                f"{moved} Counts may be off until the next sync retries it (or run /reset).\n"
+                f"`{type(e).__name__}: {e}`"
+            ),
+            color=discord.Color.orange()
+        )
+    else:
+        embed = discord.Embed(
+            title="🗄️ Archive complete",
+            description=f"{moved} Counts and leaderboards are unchanged.",
+            color=discord.Color.green()
+        )
+    await interaction.followup.send(embed=embed, ephemeral=True)
 
 @bot.tree.command(name="bulklog", description="Dealer: log a total count of sales (dealer channels only)")
 async def bulklog(interaction: discord.Interaction):